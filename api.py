@@ -0,0 +1,216 @@
+"""Read-only JSON API over the catalog, for bots and chat integrations.
+
+    python api.py --port 8502        # or: uvicorn api:app --port 8502
+
+Serves the same catalog as the dashboard, read from the edit journal, through
+the same score matrix and recommender app.py uses. Every response body is
+built once per data version, so a request is one dict lookup. Each response
+carries the data version as its ETag and answers If-None-Match with a 304. A
+background task checks the store's edit seq once a second and rebuilds the
+responses off the event loop when an edit is saved.
+
+    GET /v1/version                   data version and tool count
+    GET /v1/tools                     every tool with its overall score
+    GET /v1/tools/{name}              one tool's full record
+    GET /v1/scores                    tool -> category -> score
+    GET /v1/leaders                   best tool per category
+    GET /v1/recommendations           best tool per profile, task and priority
+    GET /v1/recommend/{slug}          top tools for one profile, task or priority,
+                                      e.g. /v1/recommend/code-debugging
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+
+from catalog import data_version
+from journal import journal_stamp, read_catalog
+from recommender import PRIORITY_WEIGHTS, PROFILE_WEIGHTS, TASK_WEIGHTS, Recommender
+from score_matrix import build_score_matrix
+
+# Seconds between checks of the catalog store for saved edits
+RELOAD_INTERVAL = 1.0
+
+# Tools listed per /v1/recommend answer
+TOP_K = 3
+
+logger = logging.getLogger(__name__)
+
+
+def slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def _score(value):
+    # JSON has no NaN; unrated categories are null
+    return None if value != value else float(value)
+
+
+def _ranking(recommender, weights):
+    return [{'tool': tool, 'fit': round(fit, 3)} for tool, fit in recommender.rank(weights, k=TOP_K)]
+
+
+def build_payloads(data):
+    """Path -> JSON-serialisable body for every endpoint at this data version."""
+    version = data_version(data)
+    matrix = build_score_matrix(data['tools'])
+    recommender = Recommender(matrix)
+    overall = dict(zip(matrix.tools, matrix.overall().tolist()))
+    scores = {
+        tool: {c: _score(v) for c, v in zip(matrix.categories, row)}
+        for tool, row in zip(matrix.tools, matrix.scores().tolist())
+    }
+
+    payloads = {
+        '/v1/version': {'version': version, 'tools': len(matrix.tools)},
+        '/v1/tools': [{
+            'name': name,
+            'best_for': tool['best_for'],
+            'free': tool['price']['free'],
+            'paid': tool['price']['paid'],
+            'overall': round(overall[name], 2),
+        } for name, tool in data['tools'].items()],
+        '/v1/scores': {'categories': matrix.categories, 'scores': scores},
+        '/v1/leaders': {
+            category: {'tool': tool, 'score': _score(score)}
+            for category, tool, score in matrix.leaders(matrix.categories)
+        },
+    }
+    for name, tool in data['tools'].items():
+        payloads[f'/v1/tools/{name}'] = {'name': name, **tool, 'overall': round(overall[name], 2)}
+
+    groups = {'profiles': PROFILE_WEIGHTS, 'tasks': TASK_WEIGHTS, 'priorities': PRIORITY_WEIGHTS}
+    payloads['/v1/recommendations'] = {
+        group: {name: recommender.best(weights) for name, weights in named.items()}
+        for group, named in groups.items()
+    }
+    for group, named in groups.items():
+        for name, weights in named.items():
+            payloads[f'/v1/recommend/{slug(name)}'] = {
+                'name': name, 'kind': group, 'weights': weights, 'ranking': _ranking(recommender, weights),
+            }
+    return version, payloads
+
+
+class Responses:
+    """Encoded bodies and headers for one data version."""
+
+    def __init__(self, data):
+        self.version, payloads = build_payloads(data)
+        self.etag = f'"{self.version}"'.encode('ascii')
+        self._not_modified = [(b'etag', self.etag), (b'cache-control', b'no-cache')]
+        self._entries = {}
+        for path, payload in payloads.items():
+            body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            self._entries[path] = (body, [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('ascii')),
+                *self._not_modified,
+            ])
+        self.not_found = _error(404, "Not found")
+
+    def get(self, path, if_none_match):
+        entry = self._entries.get(path.rstrip('/') or path)
+        if entry is None:
+            return self.not_found
+        if if_none_match is not None and self._matches(if_none_match):
+            return 304, b'', self._not_modified
+        return (200, *entry)
+
+    def _matches(self, header):
+        if header.strip() == b'*':
+            return True
+        return any(tag.strip().removeprefix(b'W/') == self.etag for tag in header.split(b','))
+
+
+def _error(status, message, *headers):
+    body = json.dumps({'error': message}).encode('utf-8')
+    return status, body, [(b'content-type', b'application/json'),
+                          (b'content-length', str(len(body)).encode('ascii')), *headers]
+
+
+METHOD_NOT_ALLOWED = _error(405, "Method not allowed", (b'allow', b'GET, HEAD'))
+
+
+class CatalogApi:
+    """ASGI app serving the current Responses; reloads them when the journal changes."""
+
+    def __init__(self, journal_dir=None):
+        self.journal_dir = journal_dir
+        self.responses = None
+        self._stamp = None
+
+    def reload(self):
+        stamp = journal_stamp(self.journal_dir)
+        if stamp != self._stamp or self.responses is None:
+            responses = Responses(read_catalog(self.journal_dir))
+            if self.responses is None or responses.version != self.responses.version:
+                logger.info("Serving data version %s", responses.version)
+            # Swapped in one assignment, so a request sees either version whole
+            self.responses, self._stamp = responses, stamp
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception:
+                logger.exception("Could not reload the catalog")
+
+    async def _lifespan(self, receive, send):
+        watcher = None
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await asyncio.to_thread(self.reload)
+                watcher = asyncio.create_task(self._watch())
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if watcher is not None:
+                    watcher.cancel()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        if self.responses is None:
+            # Servers without lifespan support load on the first request
+            await asyncio.to_thread(self.reload)
+
+        if scope['method'] in ('GET', 'HEAD'):
+            if_none_match = None
+            for name, value in scope['headers']:
+                if name == b'if-none-match':
+                    if_none_match = value
+                    break
+            status, body, headers = self.responses.get(scope['path'], if_none_match)
+        else:
+            status, body, headers = METHOD_NOT_ALLOWED
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+
+app = CatalogApi()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the catalog as a read-only JSON API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    # The access log alone would cost more than serving the request
+    uvicorn.run(app, host=args.host, port=args.port, access_log=False, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,20 @@
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-import json
 from datetime import datetime
 
+from assets import BRAND_COLORS, ToolColors, get_asset_store
+from cards import comparison_card, feature_card, leader_card, recommendation_card
+from catalog import (carry_over_caches, data_version, init_session_catalog, session_recommender,
+                     session_score_matrix, session_search_index, session_tools)
+from exports import EXPORT_FORMATS, export_artifact
+from figures import cached_figure, get_figure_stats, plot_figure, trend_figure
+from importer import detect_format, merge_import, read_catalog
+from journal import MISSING, apply_changes, changed_tools, diff_changes, get_edit_journal
+from profiler import finish_profiling, profile_section, profiled, render_profile_panel, start_profiling
+from recommender import PRIORITY_WEIGHTS, TASK_WEIGHTS
+from search import matching_snippets
+from telemetry import WINDOWS, get_telemetry, track
+from trace_filter import filtered_charts
+
 # Page configuration
 st.set_page_config(
     page_title="AI Tools Comparison - MDAA Team",
@@ -13,194 +23,150 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Modern color palette - works in both light and dark mode
-COLORS = {
-    'ChatGPT': '#74AA9C',  # Sage green
-    'Claude': '#E67E50',   # Terracotta
-    'Gemini': '#F4B942',   # Warm yellow
-    'Perplexity': '#2E7D87' # Deep teal
-}
+# Sidebar "Profile" toggle (see profiler.py); read before anything else runs so
+# the whole rerun is covered
+start_profiling(st.session_state.get("profile", False))
 
-# Tool logos with actual URLs
-LOGOS = {
-    'ChatGPT': 'https://cdn.oaistatic.com/_next/static/media/apple-touch-icon.82af6fe1.png',
-    'Claude':  'https://i.namu.wiki/i/RCyWSYQpcaimM9Mt_bbdnA_6b3DPDME0I_pfdv1Wm-x3JXK3o_l6zLaSFUDhT7ln54bnIIKp2Rg0_6ssPg_eUXMtWJq5Mmp4i1nra2RkpnoBZu8vQd5QmV_eDhDwyY1KQahyrcOYc0P3rZSkgVjv1Q.svg',
-    'Gemini': 'https://upload.wikimedia.org/wikipedia/commons/thumb/c/c1/Google_%22G%22_logo.svg/480px-Google_%22G%22_logo.svg.png',
-    'Perplexity': 'https://i.namu.wiki/i/Ix-v4RWLZiVwkd-LMEdI2KzlrCNm8KKJFV3eQR04uWUx4xrA5DeI-XcimnJ5yvUG_IMkWOdX2RRA69R4J9I6DEfjJTUYASDof2WQM0vXqMqf2sgXMHMPc-zT3K9AXEsS4nXkPosqo0uNI386yKSS6Q.svg'
-}
+# Brand colors, with a stable fallback for tools added later
+COLORS = ToolColors(BRAND_COLORS)
 
-# Custom CSS with dark mode support
-st.markdown("""
-<style>
-    .stMetric {
-        background-color: rgba(28, 31, 35, 0.5);
-        padding: 15px;
-        border-radius: 12px;
-        border-left: 4px solid;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .card {
-        background: rgba(28, 31, 35, 0.5);
-        padding: 20px;
-        border-radius: 16px;
-        margin: 10px 0;
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-    }
-    .tool-header {
-        font-size: 24px;
-        font-weight: 600;
-        margin-bottom: 10px;
-        padding: 10px;
-        border-radius: 8px;
-    }
-    .recommendation-box {
-        background: rgba(244, 185, 66, 0.1);
-        padding: 20px;
-        border-radius: 12px;
-        border: 2px solid #F4B942;
-        margin: 15px 0;
-    }
-    .nuance-tag {
-        display: inline-block;
-        padding: 4px 12px;
-        border-radius: 20px;
-        font-size: 12px;
-        font-weight: 500;
-        margin: 4px;
-    }
-    .feature-box {
-        background: rgba(28, 31, 35, 0.3);
-        padding: 15px;
-        border-radius: 10px;
-        margin: 10px 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+with profile_section("Data load"):
+    init_session_catalog()
+
+    # Logos and CSS are served from the local static asset store (see assets.py)
+    asset_store = get_asset_store(st.session_state.data_version, session_tools())
+    LOGOS = asset_store.logos
+
+    # Custom CSS with dark mode support
+    st.markdown(asset_store.css_tag(), unsafe_allow_html=True)
+
+
+def mark_data_changed(changed_tools=(), score_tools=()):
+    # Re-key every cached view after an edit; entries not involving the changed
+    # tools are carried over as-is (see catalog.carry_over_caches). The matrix
+    # cached for the old version gives the categories before the edit
+    old_version = st.session_state.data_version
+    old_categories = session_score_matrix().categories
+    st.session_state.data_version = data_version(st.session_state.data)
+    carry_over_caches(old_version, st.session_state.data_version, session_tools(), session_score_matrix(),
+                      changed_tools, score_tools, old_categories)
+
+
+def record_edit(changes):
+    # Append the delta to the shared edit journal (see journal.py). Sessions
+    # running on injected data, like the benchmarks, are not journaled
+    if st.session_state.get('journaled'):
+        get_edit_journal().record(changes)
+
+
+def step_journal(step):
+    # Undo or redo the latest journaled edit on this session's catalog
+    changes = step()
+    if changes:
+        apply_changes(st.session_state.data, changes)
+        tools, score_tools = changed_tools(changes)
+        # The keyed score sliders keep their own state; drop it so they show
+        # the restored scores instead of re-saving the undone ones
+        prefixes = tuple(f"score_{tool}_" for tool in score_tools)
+        for key in [key for key in st.session_state if key.startswith(prefixes)]:
+            del st.session_state[key]
+        mark_data_changed(tools, score_tools)
+
+
+def track_choice(kind, key, ignore=None):
+    # on_change callback: log which option was picked (see telemetry.py)
+    value = st.session_state[key]
+    if value != ignore:
+        track(kind, value)
+
+
+def track_comparison():
+    # on_change callback for the side-by-side picker; logs complete pairs only
+    if len(st.session_state.compare_tools) == 2:
+        track('comparison', " vs ".join(sorted(st.session_state.compare_tools)))
+
+
+# Score matrix shared by all charts and tables
+with profile_section("Score matrix"):
+    score_matrix = session_score_matrix()
+
+
+def render_chart(kind):
+    # Filtered to the sidebar selection on the server, or in the browser (see trace_filter.py)
+    if client_filter:
+        fig = cached_figure(kind, st.session_state.data_version, score_matrix, score_matrix.tools, COLORS)
+        filtered_charts({kind: fig}, f"{st.session_state.data_version}:{kind}", score_matrix.tools,
+                        selected_tools, COLORS, key=f"trace_filter_{kind}")
+    else:
+        plot_figure(kind, cached_figure(kind, st.session_state.data_version, score_matrix, selected_tools, COLORS))
+
+
+@st.fragment
+def render_task_picker():
+    # Fragment: picking a task only reruns this block
+    task = st.selectbox(
+        "What do you need to do?",
+        ["Select a task..."] + list(TASK_WEIGHTS),
+        key="quick_task",
+        on_change=track_choice,
+        args=('task', "quick_task", "Select a task...")
+    )
+    
+    if task != "Select a task...":
+        # Ranked from the score matrix by the task's category weights
+        ranking = session_recommender().rank(TASK_WEIGHTS[task], k=3)
+        recommended = ranking[0][0]
+        st.success(f"🎯 Recommended: **{recommended}**")
+        st.info(session_tools()[recommended]['best_for'])
+        if len(ranking) > 1:
+            st.caption("Also consider: " + ", ".join(f"{name} ({fit:.1f})" for name, fit in ranking[1:]))
+
+
+@st.fragment
+def render_feature_search():
+    # Fragment: typing a query only reruns this block
+    query = st.text_input(
+        "Search strengths, weaknesses and features",
+        placeholder="e.g. citations, screen shar..."
+    )
+    
+    if query.strip():
+        hits = session_search_index().search(query, limit=5)
+        if not hits:
+            st.caption("No matching tools")
+        for name, _ in hits:
+            snippets = matching_snippets(session_tools()[name], query, limit=2)
+            st.markdown(f"**{name}**  \n" + "  \n".join(f"• {text}" for _, text in snippets))
 
-# Initialize session state with enhanced data
-if 'data' not in st.session_state:
-    st.session_state.data = {
-        'tools': {
-            'ChatGPT': {
-                'logo': 'https://cdn.oaistatic.com/_next/static/media/apple-touch-icon.82af6fe1.png',
-                'strengths': ['General tasks', 'Coding with Code Interpreter', 'Creative writing', 'Conversational AI', 'Custom GPTs', 'DALL-E integration'],
-                'weaknesses': ['Can be verbose', 'Knowledge cutoff issues', 'Sometimes hallucinates', 'No native citations'],
-                'nuances': ['Best voice mode', 'Excellent mobile app', 'Strong ecosystem', 'Canvas for editing'],
-                'best_for': 'Creative professionals and general users',
-                'price': {'free': True, 'paid': 20},
-                'scores': {
-                    'Writing': 9,
-                    'Coding': 9,
-                    'Research': 6,
-                    'Analysis': 7,
-                    'Creative': 10,
-                    'Conversation': 10,
-                    'Current Info': 5
-                }
-            },
-            'Claude': {
-                'logo': 'https://www-cdn.anthropic.com/images/claude-app-icon.png',
-                'strengths': ['Long documents (200K tokens)', 'Deep analysis', 'Nuanced writing', 'Code debugging', 'Artifacts feature', 'Projects for context'],
-                'weaknesses': ['No image generation', 'No web search', 'Can be overly cautious', 'Limited integrations'],
-                'nuances': ['Best for long-form content', 'Superior context retention', 'Excellent at following complex instructions', 'Artifacts for iterative work'],
-                'best_for': 'Writers, analysts, and developers working with complex documents',
-                'price': {'free': True, 'paid': 20},
-                'scores': {
-                    'Writing': 10,
-                    'Coding': 10,
-                    'Research': 5,
-                    'Analysis': 10,
-                    'Creative': 9,
-                    'Conversation': 8,
-                    'Current Info': 5
-                }
-            },
-            'Gemini': {
-                'logo': 'https://www.gstatic.com/lamda/images/gemini_favicon_f069958c85030456e93de685481c559f160ea06b.png',
-                'strengths': ['Google integration', 'Multilingual', 'Multimodal', 'Fast responses', 'Best video calls', 'Screen sharing'],
-                'weaknesses': ['Less consistent', 'Smaller community', 'Less refined outputs', 'Limited customization'],
-                'nuances': ['BEST video call & screen sharing features', 'Seamless Google Workspace integration', 'Real-time collaboration', 'YouTube analysis'],
-                'best_for': 'Google users, video meetings, and visual learners',
-                'price': {'free': True, 'paid': 20},
-                'scores': {
-                    'Writing': 7,
-                    'Coding': 7,
-                    'Research': 8,
-                    'Analysis': 7,
-                    'Creative': 6,
-                    'Conversation': 7,
-                    'Current Info': 8
-                }
-            },
-            'Perplexity': {
-                'logo': 'https://www.perplexity.ai/favicon.ico',
-                'strengths': ['Real-time research', 'Source citations', 'Current events', 'Academic mode', 'Focus mode', 'Multiple search engines'],
-                'weaknesses': ['Not creative', 'Limited conversation memory', 'No code execution', 'Basic UI'],
-                'nuances': ['Chats NOT in focus - BEST for pure search', 'Pro searches with multiple models', 'Academic citations', 'Daily news digest'],
-                'best_for': 'Researchers, students, and fact-checkers',
-                'price': {'free': True, 'paid': 20},
-                'scores': {
-                    'Writing': 6,
-                    'Coding': 5,
-                    'Research': 10,
-                    'Analysis': 8,
-                    'Creative': 3,
-                    'Conversation': 5,
-                    'Current Info': 10
-                }
-            }
-        },
-        'use_cases': {
-            'Marketing Teams': ['ChatGPT', 'Claude', 'Perplexity'],
-            'Data Analysts': ['Claude', 'Perplexity', 'Gemini'],
-            'Content Writers': ['Claude', 'ChatGPT', 'Perplexity'],
-            'Developers': ['Claude', 'ChatGPT', 'Gemini'],
-            'Researchers': ['Perplexity', 'Claude', 'Gemini'],
-            'Project Managers': ['Gemini', 'Claude', 'ChatGPT']
-        },
-        'recommendations': {
-            'quick_answers': 'Perplexity',
-            'long_documents': 'Claude',
-            'creative_work': 'ChatGPT',
-            'video_collaboration': 'Gemini',
-            'academic_research': 'Perplexity',
-            'code_review': 'Claude',
-            'brainstorming': 'ChatGPT',
-            'screen_sharing': 'Gemini'
-        }
-    }
 
 # Sidebar
-with st.sidebar:
+with st.sidebar, profile_section("Sidebar"):
     st.title("⚙️ Dashboard Controls")
     st.markdown("**MDAA Team** | Marketing Data & Advanced Analytics")
     
     st.markdown("### 🎯 Quick Recommendations")
     
-    task = st.selectbox(
-        "What do you need to do?",
-        ["Select a task...", "Research with citations", "Write long content", "Creative brainstorming", 
-         "Video collaboration", "Code debugging", "Current events", "Data analysis"]
-    )
+    render_task_picker()
     
-    if task != "Select a task...":
-        task_map = {
-            "Research with citations": "Perplexity",
-            "Write long content": "Claude",
-            "Creative brainstorming": "ChatGPT",
-            "Video collaboration": "Gemini",
-            "Code debugging": "Claude",
-            "Current events": "Perplexity",
-            "Data analysis": "Claude"
-        }
-        recommended = task_map.get(task, "ChatGPT")
-        st.success(f"🎯 Recommended: **{recommended}**")
-        st.info(st.session_state.data['tools'][recommended]['best_for'])
+    st.markdown("### 🔎 Search")
+    
+    render_feature_search()
     
     st.divider()
     
-    edit_mode = st.toggle("Edit Mode", value=False)
+    edit_col, profile_col = st.columns(2)
+    edit_mode = edit_col.toggle("Edit Mode", value=False)
+    profile_col.toggle("Profile", key="profile",
+                       help="Time each section of the script; results appear below the footer")
+    
+    st.divider()
+    
+    # Navigation
+    st.subheader("Navigation")
+    lazy_tabs = st.toggle("Render Active Tab Only", value=True,
+                          help="Only build the tab you are looking at")
+    keep_visited_tabs = st.toggle("Keep Visited Tabs Loaded", value=False, disabled=not lazy_tabs,
+                                  help="Also rebuild tabs you already opened so switching back is instant")
     
     st.divider()
     
@@ -211,25 +177,121 @@ with st.sidebar:
         options=list(st.session_state.data['tools'].keys()),
         default=list(st.session_state.data['tools'].keys())
     )
+    client_filter = st.toggle(
+        "Filter Charts in Browser",
+        value=False,
+        disabled=not asset_store.static_serving,
+        help="Send each chart once with every tool and filter it in the page, without a rerun"
+    )
     
     st.divider()
     
     # Export/Import
+    export_format = st.selectbox(
+        "Export format",
+        list(EXPORT_FORMATS),
+        format_func=lambda fmt: EXPORT_FORMATS[fmt].label
+    )
     if st.button("📥 Export Data"):
-        json_data = json.dumps(st.session_state.data, indent=2)
-        st.download_button(
-            label="Download JSON",
-            data=json_data,
-            file_name=f"ai_comparison_mdaa_{datetime.now().strftime('%Y%m%d')}.json",
-            mime="application/json"
-        )
+        # Built once per data version and kept on disk (see exports.py)
+        artifact = export_artifact(export_format, st.session_state.data_version,
+                                   st.session_state.data, score_matrix)
+        spec = EXPORT_FORMATS[export_format]
+        file_name = f"ai_comparison_mdaa_{datetime.now().strftime('%Y%m%d')}{spec.ext}"
+        if asset_store.static_serving:
+            # Served from disk by the static route rather than held in session memory
+            st.markdown(
+                f'<a href="{artifact.url}" download="{file_name}">⬇️ Download {spec.label}</a> '
+                f'({artifact.size / 1024:,.1f} KiB)',
+                unsafe_allow_html=True
+            )
+        else:
+            st.download_button(
+                label=f"Download {spec.label}",
+                data=artifact.read,
+                file_name=file_name,
+                mime=spec.mime,
+                on_click="ignore"
+            )
+    
+    uploaded = st.file_uploader(
+        "📤 Import Data",
+        type=['json', 'jsonl', 'ndjson', 'csv'],
+        help="An exported JSON file, JSON Lines or CSV. Tools are merged by name."
+    )
+    if uploaded is not None and st.button("Import", use_container_width=True):
+        try:
+            result = read_catalog(uploaded, detect_format(uploaded.name))
+        except ValueError as exc:
+            st.error(f"Import failed: {exc}")
+        else:
+            # One batched merge and a single cache invalidation for the whole file
+            existing = set(st.session_state.data['tools'])
+            before = {name: st.session_state.data['tools'].get(name, MISSING) for name in result.tools}
+            before_use_cases = {name: st.session_state.data['use_cases'].get(name, MISSING) for name in result.use_cases}
+            changed, score_changed = merge_import(st.session_state.data, result)
+            # The whole import is one journal entry, so a single undo reverts it
+            record_edit(
+                [c for name in changed
+                 for c in diff_changes(['tools', name], before[name], st.session_state.data['tools'][name])]
+                + [c for name, members in result.use_cases.items()
+                   for c in diff_changes(['use_cases', name], before_use_cases[name], members)]
+            )
+            if changed or result.use_cases:
+                mark_data_changed(changed, score_changed)
+            st.session_state.import_summary = (
+                f"Imported {len(changed)} tools ({len(set(changed) - existing)} new) "
+                f"and {len(result.use_cases)} use cases from {result.records} records",
+                result.rejected,
+                result.errors,
+            )
+            st.rerun()
+    
+    if 'import_summary' in st.session_state:
+        message, rejected, errors = st.session_state.pop('import_summary')
+        st.success(f"✅ {message}")
+        if rejected:
+            with st.expander(f"⚠️ {rejected} records rejected"):
+                st.text('\n'.join(errors))
+    
+    # Usage counters for maintainers, shown with ?admin=1
+    if st.query_params.get("admin") == "1":
+        st.divider()
+        with st.expander("📈 Usage"):
+            import pandas as pd
+            
+            telemetry = get_telemetry()
+            window = st.radio("Window", list(WINDOWS), horizontal=True)
+            for kind, label in [('task', "Sidebar tasks"), ('priority', "Tab 1 priorities"), ('comparison', "Tab 4 comparisons")]:
+                counts = telemetry.counts(kind, WINDOWS[window])
+                st.markdown(f"**{label}**")
+                if counts:
+                    st.dataframe(pd.DataFrame(counts.most_common(10), columns=["Choice", "Uses"]), hide_index=True)
+                else:
+                    st.caption("No events yet")
+            if telemetry.dropped:
+                st.caption(f"{telemetry.dropped} events dropped while the buffer was full")
+            
+            # Figure JSON sent by this server process (see figures.plot_figure)
+            st.markdown("**Figure payloads**")
+            figure_rows = get_figure_stats().rows()
+            if figure_rows:
+                st.dataframe(pd.DataFrame([{
+                    'Figure': kind,
+                    'Sends': sends,
+                    'Avg KiB': round(total / sends / 1024, 1),
+                    'Last KiB': round(last / 1024, 1),
+                } for kind, sends, total, last in figure_rows]), hide_index=True)
+            else:
+                st.caption("No figures sent yet")
 
 # Main content
-st.title("AI Apps Comparison")
-st.markdown("### MDAA Team - Marketing Data & Advanced Analytics (INTERNAL)")
+with profile_section("Header"):
+    st.title("AI Apps Comparison")
+    st.markdown("### MDAA Team - Marketing Data & Advanced Analytics (INTERNAL)")
 
-# Recommendation banner
-st.markdown("""
+    # Recommendation banner
+    st.markdown("""
 <div class="recommendation-box">
     <h3>💡 Quick Summary</h3>
     <p><strong>Gemini</strong> has the BEST video call and screen sharing features for team collaboration</p>
@@ -238,106 +300,55 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Key metrics with logos
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric("🏆 Best for Research", "Perplexity", "Real-time + Citations")
-with col2:
-    st.metric("📝 Best for Analysis", "Claude", "200K token context")
-with col3:
-    st.metric("🎨 Most Creative", "ChatGPT", "Creative Content")
-with col4:
-    st.metric("📹 Best Collab", "Gemini", "Video + Screen Share")
-
-st.divider()
-
-# Tabs
-tab1, tab2, tab3, tab4, tab6 = st.tabs([
-    "🎯 Smart Recommendations", 
-    "📊 Capability Analysis", 
-    "🔍 Unique Features",
-    "📋 Detailed Comparison",
-    #"👥 Use Cases",
-    "✏️ Edit Data"
-])
+    # Key metrics with logos
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("🏆 Best for Research", "Perplexity", "Real-time + Citations")
+    with col2:
+        st.metric("📝 Best for Analysis", "Claude", "200K token context")
+    with col3:
+        st.metric("🎨 Most Creative", "ChatGPT", "Creative Content")
+    with col4:
+        st.metric("📹 Best Collab", "Gemini", "Video + Screen Share")
+
+    st.divider()
+
+
+@st.fragment
+def render_priority_picker():
+    # Fragment: changing the priority only reruns this block
+    st.markdown("### 🎯 Choose Your Priority")
+    
+    priority = st.radio(
+        "What matters most for your task?",
+        list(PRIORITY_WEIGHTS),
+        key="priority",
+        on_change=track_choice,
+        args=('priority', "priority")
+    )
+    
+    recommended_tool = session_recommender().best(PRIORITY_WEIGHTS[priority])
+    st.markdown(recommendation_card(st.session_state.data_version, recommended_tool, session_tools()[recommended_tool],
+                                    COLORS[recommended_tool], LOGOS[recommended_tool]),
+                unsafe_allow_html=True)
+
 
 # TAB 1: Smart Recommendations
-with tab1:
+@profiled("🎯 Smart Recommendations")
+def render_recommendations():
     st.subheader("Personalized Tool Recommendations")
     
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        st.markdown("### 🎯 Choose Your Priority")
-        
-        priority = st.radio(
-            "What matters most for your task?",
-            ["Current Information", "Long Context Analysis", "Creative Output", "Team Collaboration", "Academic Research", "Code Quality"]
-        )
-        
-        priority_map = {
-            "Current Information": "Perplexity",
-            "Long Context Analysis": "Claude",
-            "Creative Output": "ChatGPT",
-            "Team Collaboration": "Gemini",
-            "Academic Research": "Perplexity",
-            "Code Quality": "Claude"
-        }
-        
-        recommended_tool = priority_map[priority]
-        tool_data = st.session_state.data['tools'][recommended_tool]
-        
-        st.markdown(f"""
-        <div class="card" style="border: 2px solid {COLORS[recommended_tool]};">
-            <h2 style="color: {COLORS[recommended_tool]};"><img src="{LOGOS[recommended_tool]}" style="width: 30px; height: 30px; vertical-align: middle; margin-right: 8px;"> {recommended_tool}</h2>
-            <p style="font-size: 18px; margin: 15px 0;"><strong>Perfect for:</strong> {tool_data['best_for']}</p>
-            <div style="margin: 20px 0;">
-                <h4>Key Advantages:</h4>
-                {''.join([f'<div style="margin: 8px 0;">✓ {s}</div>' for s in tool_data['strengths'][:3]])}
-            </div>
-            <div style="margin: 20px 0;">
-                <h4>Unique Features:</h4>
-                {''.join([f'<span class="nuance-tag" style="background: {COLORS[recommended_tool]}33; color: {COLORS[recommended_tool]}; padding: 4px 8px; margin: 4px; border-radius: 12px; display: inline-block;">{n}</span>' for n in tool_data['nuances'][:2]])}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        render_priority_picker()
     
     with col2:
         st.markdown("### 📊 Tool Comparison Matrix")
         
         # Full radar chart with all metrics
-        categories = list(list(st.session_state.data['tools'].values())[0]['scores'].keys())
-        
-        fig = go.Figure()
-        
-        for tool_name in selected_tools:
-            tool_data = st.session_state.data['tools'][tool_name]
-            scores = [tool_data['scores'][cat] for cat in categories]
-            
-            fig.add_trace(go.Scatterpolar(
-                r=scores,
-                theta=categories,
-                fill='toself',
-                name=tool_name,
-                line=dict(color=COLORS[tool_name], width=3),
-                fillcolor=COLORS[tool_name],
-                opacity=0.25
-            ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(visible=True, range=[0, 10], gridcolor='rgba(255,255,255,0.2)'),
-                angularaxis=dict(gridcolor='rgba(255,255,255,0.2)')
-            ),
-            showlegend=True,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=400,
-            font=dict(color='white')
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart('radar')
     
     st.divider()
     
@@ -365,7 +376,8 @@ with tab1:
     #         """, unsafe_allow_html=True)
 
 # TAB 2: Capability Analysis  
-with tab2:
+@profiled("📊 Capability Analysis")
+def render_capabilities():
     st.subheader("Detailed Capability Breakdown")
     
     # Enhanced capability comparison
@@ -373,86 +385,112 @@ with tab2:
     
     with col1:
         # Create enhanced heatmap
-        df_scores = pd.DataFrame({
-            tool: st.session_state.data['tools'][tool]['scores']
-            for tool in selected_tools
-        }).T
-        
-        fig = px.imshow(
-            df_scores,
-            labels=dict(x="Capability", y="AI Tool", color="Score"),
-            x=df_scores.columns,
-            y=df_scores.index,
-            color_continuous_scale='Viridis',
-            aspect="auto",
-            text_auto=True
-        )
-        
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=400,
-            font=dict(color='white', size=12)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart('heatmap')
     
     with col2:
         st.markdown("### 🏆 Category Leaders")
         
-        for category in ['Writing', 'Research', 'Creative', 'Analysis']:
-            scores = {tool: st.session_state.data['tools'][tool]['scores'][category] 
-                     for tool in selected_tools}
-            winner = max(scores, key=scores.get)
-            
-            st.markdown(f"""
-            <div class="card" style="border-left: 4px solid {COLORS[winner]};">
-                <div style="font-weight: 600; color: {COLORS[winner]}; font-size: 14px;">
-                    {category.upper()}
-                </div>
-                <div style="font-size: 20px; margin: 5px 0;">
-                    <img src="{LOGOS[winner]}" style="width: 20px; height: 20px; vertical-align: middle; margin-right: 5px;"> {winner}
-                </div>
-                <div style="color: #888; font-size: 14px;">
-                    Score: {scores[winner]}/10
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        leaders = score_matrix.leaders(['Writing', 'Research', 'Creative', 'Analysis'], selected_tools)
+        st.markdown(''.join(
+            leader_card(st.session_state.data_version, category, winner, score, COLORS[winner], LOGOS[winner])
+            for category, winner, score in leaders
+        ), unsafe_allow_html=True)
     
     st.divider()
     
     # Strength comparison bars
     st.markdown("### 💪 Comparative Strengths")
     
-    strength_categories = ['Writing', 'Coding', 'Research', 'Analysis', 'Creative', 'Current Info']
-    
-    fig = go.Figure()
-    
-    for tool in selected_tools:
-        scores = [st.session_state.data['tools'][tool]['scores'].get(cat, 0) for cat in strength_categories]
-        fig.add_trace(go.Bar(
-            name=tool,
-            x=strength_categories,
-            y=scores,
-            marker_color=COLORS[tool],
-            text=scores,
-            textposition='outside'
-        ))
-    
-    fig.update_layout(
-        barmode='group',
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        height=400,
-        font=dict(color='white'),
-        yaxis=dict(range=[0, 11], gridcolor='rgba(255,255,255,0.1)'),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)')
-    )
+    render_chart('strengths')
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.divider()
+    
+    render_score_trends()
+
+
+# Trend windows in days (None: the whole history)
+TREND_WINDOWS = {"Last quarter": 91, "Last year": 365, "All time": None}
+
+
+@st.fragment
+def render_score_trends():
+    # Fragment: switching category or window only reruns this block
+    st.markdown("### 📈 Score Trends")
+    
+    col1, col2 = st.columns([1, 2])
+    category = col1.selectbox("Capability", score_matrix.categories, key="trend_category")
+    window = col2.radio("Window", list(TREND_WINDOWS), horizontal=True, key="trend_window")
+    
+    days = TREND_WINDOWS[window]
+    since = None if days is None else datetime.now().timestamp() - days * 86400
+    # Every saved score change is a point in the journal's score history (see score_history.py)
+    series = get_edit_journal().history.series(selected_tools, category, since=since)
+    if series:
+        plot_figure('trend', trend_figure(series, category, COLORS))
+    else:
+        st.info("No score history for the selected tools yet")
+
+FEATURE_SORTS = ["Catalog order", "Name", "Overall score"]
+FEATURE_PAGE_SIZES = [6, 12, 24, 48]
+
+
+def reset_feature_page():
+    st.session_state.features_page = 0
+
+
+def move_feature_page(step):
+    st.session_state.features_page = st.session_state.get('features_page', 0) + step
+
+
+def sorted_feature_tools(tools, sort_by):
+    if sort_by == "Name":
+        return sorted(tools, key=str.lower)
+    if sort_by == "Overall score":
+        overall = session_score_matrix().overall(tools)
+        return [tools[i] for i in (-overall).argsort(kind='stable')]
+    return list(tools)
+
+
+@st.fragment
+def render_feature_cards(tools):
+    # Fragment: sorting and paging only rerun the card grid, and only the
+    # cards on the current page are built
+    col_sort, col_size = st.columns([2, 1])
+    with col_sort:
+        sort_by = st.selectbox("Sort by", FEATURE_SORTS, key="features_sort", on_change=reset_feature_page)
+    with col_size:
+        page_size = st.selectbox("Cards per page", FEATURE_PAGE_SIZES, key="features_page_size",
+                                 on_change=reset_feature_page)
+    
+    ordered = sorted_feature_tools(tools, sort_by)
+    page_count = max(1, (len(ordered) + page_size - 1) // page_size)
+    page = min(max(st.session_state.get('features_page', 0), 0), page_count - 1)
+    st.session_state.features_page = page
+    start = page * page_size
+    
+    cols = st.columns(2)
+    
+    for idx, tool_name in enumerate(ordered[start:start + page_size]):
+        with cols[idx % 2]:
+            st.markdown(feature_card(st.session_state.data_version, tool_name, session_tools()[tool_name],
+                                     COLORS[tool_name], LOGOS[tool_name]),
+                        unsafe_allow_html=True)
+    
+    if page_count > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("← Previous", key="features_prev", disabled=page == 0,
+                      on_click=move_feature_page, args=(-1,), use_container_width=True)
+        with col_page:
+            st.caption(f"Page {page + 1} of {page_count} · tools {start + 1}-{min(start + page_size, len(ordered))} of {len(ordered)}")
+        with col_next:
+            st.button("Next →", key="features_next", disabled=page == page_count - 1,
+                      on_click=move_feature_page, args=(1,), use_container_width=True)
+
 
 # TAB 3: Unique Features
-with tab3:
+@profiled("🔍 Unique Features")
+def render_unique_features():
     st.subheader("🌟 Unique Features & Hidden Gems")
     
     # Feature highlights
@@ -470,60 +508,40 @@ with tab3:
     
     st.divider()
     
-    # Detailed feature cards - Fixed HTML rendering issue
-    cols = st.columns(2)
-    
-    for idx, tool_name in enumerate(selected_tools):
-        with cols[idx % 2]:
-            tool = st.session_state.data['tools'][tool_name]
-            
-            with st.container():
-                # Display logo with tool name
-                col_logo, col_name = st.columns([1, 4])
-                with col_logo:
-                    st.image(LOGOS[tool_name], width=40)
-                with col_name:
-                    st.markdown(f"### {tool_name}")
-                
-                # Unique Features section
-                st.markdown("**🌟 Unique Features**")
-                for nuance in tool['nuances']:
-                    st.markdown(f"""
-                    <span style="background: {COLORS[tool_name]}33; 
-                          color: {COLORS[tool_name]}; 
-                          padding: 4px 12px; 
-                          border-radius: 20px; 
-                          display: inline-block;
-                          margin: 4px;">
-                        {nuance}
-                    </span>
-                    """, unsafe_allow_html=True)
-                
-                # Best Use Case section
-                st.markdown("**💡 Best Use Case**")
-                st.info(tool['best_for'])
-                
-                # Pricing section
-                st.markdown("**💰 Pricing**")
-                col_free, col_paid = st.columns(2)
-                with col_free:
-                    if tool['price']['free']:
-                        st.success("Free Tier ✓")
-                    else:
-                        st.error("No Free Tier")
-                with col_paid:
-                    st.warning(f"Pro: ${tool['price']['paid']}/mo")
-                
-                st.markdown("---")
+    # Detailed feature cards, one page at a time
+    render_feature_cards(selected_tools)
+
+@st.fragment
+def render_side_by_side(tools):
+    # Fragment: picking the two tools only reruns this block
+    if len(tools) >= 2:
+        compare_tools = st.multiselect(
+            "Select exactly 2 tools to compare",
+            tools,
+            default=tools[:2],
+            max_selections=2,
+            key="compare_tools",
+            on_change=track_comparison
+        )
+        
+        if len(compare_tools) == 2:
+            for col, tool_name in zip(st.columns(2), compare_tools):
+                with col:
+                    st.markdown(comparison_card(st.session_state.data_version, tool_name, session_tools()[tool_name],
+                                                COLORS[tool_name], LOGOS[tool_name]),
+                                unsafe_allow_html=True)
+
 
 # TAB 4: Detailed Comparison
-with tab4:
+@profiled("📋 Detailed Comparison")
+def render_comparison():
     st.subheader("📊 Comprehensive Comparison Table")
     
     # Create enhanced comparison dataframe
     comparison_data = []
+    overall_scores = score_matrix.overall(selected_tools)
     
-    for tool_name in selected_tools:
+    for tool_name, overall in zip(selected_tools, overall_scores):
         tool = st.session_state.data['tools'][tool_name]
         comparison_data.append({
             'Tool': tool_name,
@@ -532,9 +550,11 @@ with tab4:
             'Unique Feature': tool['nuances'][0],
             'Free': '✅' if tool['price']['free'] else '❌',
             'Pro Price': f"${tool['price']['paid']}/mo",
-            'Overall Score': f"{sum(tool['scores'].values()) / len(tool['scores']):.1f}/10"
+            'Overall Score': f"{overall:.1f}/10"
         })
     
+    import pandas as pd
+    
     df = pd.DataFrame(comparison_data)
     
     # Display styled dataframe
@@ -561,100 +581,14 @@ with tab4:
     # Side-by-side comparison
     st.markdown("### 🔄 Side-by-Side Comparison")
     
-    if len(selected_tools) >= 2:
-        compare_tools = st.multiselect(
-            "Select exactly 2 tools to compare",
-            selected_tools,
-            default=selected_tools[:2] if len(selected_tools) >= 2 else selected_tools,
-            max_selections=2
-        )
-        
-        if len(compare_tools) == 2:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                t1 = st.session_state.data['tools'][compare_tools[0]]
-                st.markdown(f"""
-                <div class="card" style="border: 2px solid {COLORS[compare_tools[0]]};">
-                    <h3 style="color: {COLORS[compare_tools[0]]};">
-                        <img src="{LOGOS[compare_tools[0]]}" style="width: 25px; height: 25px; vertical-align: middle; margin-right: 8px;"> {compare_tools[0]}
-                    </h3>
-                    <div style="margin: 15px 0;">
-                        <h4>✅ Advantages</h4>
-                        {''.join([f'<div>• {s}</div>' for s in t1['strengths'][:4]])}
-                    </div>
-                    <div style="margin: 15px 0;">
-                        <h4>⚠️ Limitations</h4>
-                        {''.join([f'<div>• {w}</div>' for w in t1['weaknesses'][:3]])}
-                    </div>
-                    <div style="margin: 15px 0;">
-                        <h4>🌟 Unique Features</h4>
-                        {''.join([f'<div>• {n}</div>' for n in t1['nuances'][:2]])}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                t2 = st.session_state.data['tools'][compare_tools[1]]
-                st.markdown(f"""
-                <div class="card" style="border: 2px solid {COLORS[compare_tools[1]]};">
-                    <h3 style="color: {COLORS[compare_tools[1]]};">
-                        <img src="{LOGOS[compare_tools[1]]}" style="width: 25px; height: 25px; vertical-align: middle; margin-right: 8px;"> {compare_tools[1]}
-                    </h3>
-                    <div style="margin: 15px 0;">
-                        <h4>✅ Advantages</h4>
-                        {''.join([f'<div>• {s}</div>' for s in t2['strengths'][:4]])}
-                    </div>
-                    <div style="margin: 15px 0;">
-                        <h4>⚠️ Limitations</h4>
-                        {''.join([f'<div>• {w}</div>' for w in t2['weaknesses'][:3]])}
-                    </div>
-                    <div style="margin: 15px 0;">
-                        <h4>🌟 Unique Features</h4>
-                        {''.join([f'<div>• {n}</div>' for n in t2['nuances'][:2]])}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+    render_side_by_side(selected_tools)
     
     st.divider()
     
     # MDAA-specific comparison metrics
     st.markdown("### 📈 MDAA Team Performance Metrics")
-    
-    mdaa_metrics = {
-        'Marketing Content': {'ChatGPT': 10, 'Claude': 8, 'Gemini': 6, 'Perplexity': 4},
-        'Data Analysis': {'ChatGPT': 7, 'Claude': 10, 'Gemini': 7, 'Perplexity': 8},
-        'Market Research': {'ChatGPT': 6, 'Claude': 7, 'Gemini': 7, 'Perplexity': 10},
-        'Report Writing': {'ChatGPT': 8, 'Claude': 10, 'Gemini': 7, 'Perplexity': 6},
-        'Team Collaboration': {'ChatGPT': 7, 'Claude': 6, 'Gemini': 10, 'Perplexity': 4}
-    }
-    
     # Create MDAA-specific comparison chart
-    fig = go.Figure()
-    
-    for tool in selected_tools:
-        scores = [mdaa_metrics[metric].get(tool, 5) for metric in mdaa_metrics.keys()]
-        fig.add_trace(go.Bar(
-            name=tool,
-            x=list(mdaa_metrics.keys()),
-            y=scores,
-            marker_color=COLORS[tool],
-            text=scores,
-            textposition='outside'
-        ))
-    
-    fig.update_layout(
-        title="MDAA Team-Specific Performance Scores",
-        barmode='group',
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        height=400,
-        font=dict(color='white'),
-        yaxis=dict(range=[0, 11], gridcolor='rgba(255,255,255,0.1)', title="Score"),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)', title="Use Case")
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    render_chart('mdaa')
 
 # # TAB 5: Use Cases
 # with tab5:
@@ -774,10 +708,22 @@ with tab4:
 #     st.plotly_chart(fig, use_container_width=True)
 
 # TAB 6: Edit Data
-with tab6:
+@profiled("✏️ Edit Data")
+def render_edit_data():
     if not edit_mode:
         st.warning("⚠️ Enable Edit Mode in the sidebar to modify data")
     else:
+        if st.session_state.get('journaled'):
+            journal = get_edit_journal()
+            undo_col, redo_col, history_col = st.columns([1, 1, 4])
+            if undo_col.button("↩️ Undo", disabled=not journal.can_undo, use_container_width=True):
+                step_journal(journal.undo)
+                st.rerun()
+            if redo_col.button("↪️ Redo", disabled=not journal.can_redo, use_container_width=True):
+                step_journal(journal.redo)
+                st.rerun()
+            history_col.caption(f"Edit journal: {len(journal)} entries since the last checkpoint")
+        
         st.subheader("✏️ Edit Tool Information")
         
         selected_tool = st.selectbox("Select Tool to Edit", list(st.session_state.data['tools'].keys()))
@@ -821,7 +767,8 @@ with tab6:
             new_price = st.number_input(
                 "Pro Price ($)",
                 value=tool_data['price']['paid'],
-                min_value=0
+                # Imported prices may be fractional; min_value must match value's type
+                min_value=0.0 if isinstance(tool_data['price']['paid'], float) else 0
             )
         
         with col3:
@@ -838,7 +785,7 @@ with tab6:
                 )
         
         if st.button("💾 Save Changes", type="primary", use_container_width=True):
-            st.session_state.data['tools'][selected_tool] = {
+            new_tool = {
                 'logo': tool_data['logo'],
                 'best_for': new_best_for,
                 'strengths': [s.strip() for s in new_strengths.split('\n') if s.strip()],
@@ -847,7 +794,10 @@ with tab6:
                 'price': {'free': new_free, 'paid': new_price},
                 'scores': new_scores
             }
+            st.session_state.data['tools'][selected_tool] = new_tool
+            record_edit(diff_changes(['tools', selected_tool], tool_data, new_tool))
             st.success(f"✅ {selected_tool} data updated successfully!")
+            mark_data_changed([selected_tool], [selected_tool] if new_scores != tool_data['scores'] else ())
             st.rerun()
         
         st.divider()
@@ -866,7 +816,9 @@ with tab6:
         
         if st.button("💾 Save Use Case", type="primary"):
             st.session_state.data['use_cases'][selected_use_case] = new_tools
+            record_edit(diff_changes(['use_cases', selected_use_case], current_tools, new_tools))
             st.success(f"✅ {selected_use_case} updated successfully!")
+            mark_data_changed()
             st.rerun()
         
         st.divider()
@@ -882,15 +834,43 @@ with tab6:
         
         if st.button("➕ Add Use Case", type="secondary"):
             if new_use_case_name and new_use_case_tools:
+                before = st.session_state.data['use_cases'].get(new_use_case_name, MISSING)
                 st.session_state.data['use_cases'][new_use_case_name] = new_use_case_tools
+                record_edit(diff_changes(['use_cases', new_use_case_name], before, new_use_case_tools))
                 st.success(f"✅ {new_use_case_name} added successfully!")
+                mark_data_changed()
                 st.rerun()
             else:
                 st.error("Please provide both name and tools for the new use case")
 
+# Tabs - with "Render Active Tab Only" the hidden tabs are skipped entirely
+SECTIONS = {
+    "🎯 Smart Recommendations": render_recommendations,
+    "📊 Capability Analysis": render_capabilities,
+    "🔍 Unique Features": render_unique_features,
+    "📋 Detailed Comparison": render_comparison,
+    #"👥 Use Cases": render_use_cases,
+    "✏️ Edit Data": render_edit_data
+}
+
+if 'visited_sections' not in st.session_state:
+    st.session_state.visited_sections = set()
+
+tabs = st.tabs(list(SECTIONS), key="active_section", on_change="rerun" if lazy_tabs else "ignore")
+
+for (section, render), tab in zip(SECTIONS.items(), tabs):
+    with tab:
+        # tab.open is None when tabs don't track state (all tabs render)
+        if tab.open is not False:
+            st.session_state.visited_sections.add(section)
+            render()
+        elif keep_visited_tabs and section in st.session_state.visited_sections:
+            render()
+
 # Footer
-st.divider()
-st.markdown(f"""
+with profile_section("Footer"):
+    st.divider()
+    st.markdown(f"""
 <div style="text-align: center; color: #888; padding: 20px; background: rgba(28, 31, 35, 0.5); border-radius: 12px; margin-top: 30px;">
     <h4> AI Tools Comparison Dashboard - MDAA Team (INTERNAL)</h4>
     <p>Marketing Data & Advanced Analytics</p>
@@ -902,3 +882,7 @@ st.markdown(f"""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+profile = finish_profiling()
+if profile is not None:
+    render_profile_panel(profile)
@@ -0,0 +1,283 @@
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import re
+import tempfile
+import threading
+import urllib.request
+from pathlib import Path
+
+import streamlit as st
+
+from cards import get_card_cache
+
+# Source assets live in assets/, built assets are written to static/assets/ with
+# content-hash filenames and served by Streamlit's static file route
+# (server.enableStaticServing). A changed file always gets a new URL, so
+# serve.py marks those URLs immutable and browsers never re-download an
+# unchanged asset.
+APP_DIR = Path(__file__).resolve().parent
+SOURCE_DIR = APP_DIR / 'assets'
+LOCAL_LOGO_DIR = SOURCE_DIR / 'logos'
+STATIC_DIR = APP_DIR / 'static' / 'assets'
+MANIFEST_PATH = STATIC_DIR / 'manifest.json'
+STATIC_URL = 'app/static/assets'
+
+# Remote logo sources, fetched once by ingest_logos() (tool['logo'] is the fallback)
+LOGO_SOURCES = {
+    'ChatGPT': 'https://cdn.oaistatic.com/_next/static/media/apple-touch-icon.82af6fe1.png',
+    'Claude':  'https://i.namu.wiki/i/RCyWSYQpcaimM9Mt_bbdnA_6b3DPDME0I_pfdv1Wm-x3JXK3o_l6zLaSFUDhT7ln54bnIIKp2Rg0_6ssPg_eUXMtWJq5Mmp4i1nra2RkpnoBZu8vQd5QmV_eDhDwyY1KQahyrcOYc0P3rZSkgVjv1Q.svg',
+    'Gemini': 'https://upload.wikimedia.org/wikipedia/commons/thumb/c/c1/Google_%22G%22_logo.svg/480px-Google_%22G%22_logo.svg.png',
+    'Perplexity': 'https://i.namu.wiki/i/Ix-v4RWLZiVwkd-LMEdI2KzlrCNm8KKJFV3eQR04uWUx4xrA5DeI-XcimnJ5yvUG_IMkWOdX2RRA69R4J9I6DEfjJTUYASDof2WQM0vXqMqf2sgXMHMPc-zT3K9AXEsS4nXkPosqo0uNI386yKSS6Q.svg'
+}
+
+CONTENT_TYPES = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/svg+xml': '.svg',
+    'image/x-icon': '.ico',
+    'image/vnd.microsoft.icon': '.ico',
+    'text/css': '.css',
+}
+MIME_TYPES = {ext: mime for mime, ext in CONTENT_TYPES.items()}
+
+# URL path of a content-hashed file written by store_asset()
+HASHED_ASSET_PATH = re.compile(r'/static/assets/[a-z0-9-]+\.[0-9a-f]{12}\.[a-z]+$')
+
+# Modern color palette - works in both light and dark mode
+BRAND_COLORS = {
+    'ChatGPT': '#74AA9C',  # Sage green
+    'Claude': '#E67E50',   # Terracotta
+    'Gemini': '#F4B942',   # Warm yellow
+    'Perplexity': '#2E7D87' # Deep teal
+}
+
+PLACEHOLDER_COLORS = ['#74AA9C', '#E67E50', '#F4B942', '#2E7D87', '#8E7CC3', '#C2185B']
+
+logger = logging.getLogger(__name__)
+
+# One ingest at a time per process, so concurrent ones never drop each other's manifest entries
+_ingest_lock = threading.Lock()
+
+
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'asset'
+
+
+def store_asset(name, content, ext):
+    """Write content under a content-hash filename and return that filename."""
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    filename = f"{_slug(name)}.{digest}{ext}"
+    path = STATIC_DIR / filename
+    if not path.exists():
+        STATIC_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return filename
+
+
+def fallback_color(name):
+    """Stable palette color for tools without an assigned brand color."""
+    return PLACEHOLDER_COLORS[int(hashlib.md5(name.encode('utf-8')).hexdigest(), 16) % len(PLACEHOLDER_COLORS)]
+
+
+def placeholder_svg(name):
+    color = fallback_color(name)
+    initial = (name.strip()[:1] or '?').upper()
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="64" height="64" viewBox="0 0 64 64">'
+        f'<rect width="64" height="64" rx="14" fill="{color}"/>'
+        '<text x="32" y="42" font-family="sans-serif" font-size="30" font-weight="600" '
+        f'fill="white" text-anchor="middle">{initial}</text></svg>'
+    ).encode('utf-8')
+
+
+def _read_local(tool, local_dir):
+    for path in sorted(Path(local_dir).glob(_slug(tool) + '.*')):
+        if path.suffix.lower() in MIME_TYPES:
+            return path.read_bytes(), path.suffix.lower()
+    return None
+
+
+def _fetch(url, timeout):
+    request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (ai-app-comparison asset ingest)'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        content = response.read()
+        ext = CONTENT_TYPES.get(response.headers.get_content_type())
+    if ext is None:
+        ext = Path(urllib.request.url2pathname(url.split('?')[0])).suffix.lower()
+    return content, ext if ext in MIME_TYPES else '.png'
+
+
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        return json.loads(MANIFEST_PATH.read_text())
+    return {'logos': {}, 'placeholders': [], 'css': None}
+
+
+def save_manifest(manifest):
+    STATIC_DIR.mkdir(parents=True, exist_ok=True)
+    # Written to a temp file of its own and renamed, so another session or
+    # worker never reads half a manifest
+    with tempfile.NamedTemporaryFile('w', dir=STATIC_DIR, prefix=f".{MANIFEST_PATH.name}.", suffix='.tmp',
+                                     delete=False) as f:
+        f.write(json.dumps(manifest, indent=2, sort_keys=True))
+    Path(f.name).replace(MANIFEST_PATH)
+
+
+def build_css(manifest):
+    manifest['css'] = store_asset('app', (SOURCE_DIR / 'app.css').read_bytes(), '.css')
+    return manifest
+
+
+def ingest_logos(tools, local_dir=LOCAL_LOGO_DIR, retry_placeholders=False, timeout=5):
+    """Store one logo per tool, trying the local directory, then each source URL.
+
+    tools maps tool name -> the catalog's own logo URL. Tools already in the
+    manifest are skipped (unless they only have a placeholder and
+    retry_placeholders is set); tools nothing could be fetched for get a
+    generated placeholder.
+    """
+    manifest = load_manifest()
+    placeholders = set(manifest['placeholders'])
+    for tool, catalog_url in tools.items():
+        if tool in manifest['logos'] and not (retry_placeholders and tool in placeholders):
+            continue
+
+        found = _read_local(tool, local_dir) if local_dir and Path(local_dir).is_dir() else None
+        urls = [url for url in dict.fromkeys([LOGO_SOURCES.get(tool), catalog_url]) if url]
+        if not found and not urls:
+            # Nothing to ingest; logo_url() serves the shared placeholder
+            continue
+        for url in urls:
+            if found:
+                break
+            try:
+                found = _fetch(url, timeout)
+            except Exception as exc:
+                logger.warning("Could not fetch logo for %s from %s: %s", tool, url, exc)
+
+        if found:
+            manifest['logos'][tool] = store_asset(tool, *found)
+            placeholders.discard(tool)
+        else:
+            manifest['logos'][tool] = store_asset(tool, placeholder_svg(tool), '.svg')
+            placeholders.add(tool)
+
+    manifest['placeholders'] = sorted(placeholders)
+    build_css(manifest)
+    save_manifest(manifest)
+    return manifest
+
+
+class AssetStore:
+    """Resolved asset URLs for the current manifest."""
+
+    def __init__(self, manifest, static_serving, url_prefix=STATIC_URL):
+        self.manifest = manifest
+        self.static_serving = static_serving
+        # Static bundles (snapshot.py) copy the files and link them relative to the page
+        self.url_prefix = url_prefix
+        self.logos = LogoUrls(self)
+
+    def reload(self, manifest):
+        """Switch to an updated manifest; the next rerun resolves logos from it."""
+        self.manifest = manifest
+        self.logos = LogoUrls(self)
+
+    def _url(self, filename):
+        if self.static_serving:
+            return f"{self.url_prefix}/{filename}"
+        # Without static serving, inline the local copy instead of hitting a CDN
+        path = STATIC_DIR / filename
+        mime = MIME_TYPES.get(path.suffix.lower(), 'application/octet-stream')
+        return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode('ascii')}"
+
+    def logo_url(self, tool):
+        filename = self.manifest['logos'].get(tool)
+        if filename is None or not (STATIC_DIR / filename).exists():
+            # Named by content only, so tools sharing a color and initial share a file
+            filename = store_asset('placeholder', placeholder_svg(tool), '.svg')
+        return self._url(filename)
+
+    def css_tag(self):
+        if self.static_serving and self.manifest.get('css'):
+            return f'<link rel="stylesheet" href="{self.url_prefix}/{self.manifest["css"]}">'
+        return f"<style>\n{(SOURCE_DIR / 'app.css').read_text()}</style>"
+
+
+class ToolColors(dict):
+    """Brand colors by tool; tools added later get a stable fallback color."""
+
+    def __missing__(self, tool):
+        return fallback_color(tool)
+
+
+class LogoUrls(dict):
+    """Lazily resolved tool -> logo URL mapping, memoized per process."""
+
+    def __init__(self, store):
+        super().__init__()
+        self._store = store
+
+    def __missing__(self, tool):
+        url = self[tool] = self._store.logo_url(tool)
+        return url
+
+
+def _ingest_in_background(store, logos):
+    def run():
+        try:
+            with _ingest_lock:
+                manifest = ingest_logos(logos)
+        except Exception:
+            logger.exception("Could not ingest logos")
+            return
+        store.reload(manifest)
+        # Cached cards embed the placeholder URLs; rebuild them with the new logos
+        get_card_cache().clear()
+
+    threading.Thread(target=run, name='logo-ingest', daemon=True).start()
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_asset_store(version, _tools):
+    """Asset URLs for a data version; _tools is the catalog's tools dict.
+
+    Returns at once with the current manifest. Missing logos show a
+    placeholder while a background thread fetches them, and the store
+    switches to the new manifest when the fetch is done.
+    """
+    manifest = load_manifest()
+    css = manifest.get('css')
+    if build_css(manifest)['css'] != css:
+        save_manifest(manifest)
+    store = AssetStore(manifest, st.get_option('server.enableStaticServing'))
+    logos = {name: tool.get('logo') for name, tool in _tools.items()}
+    if any(name not in manifest['logos'] and (url or name in LOGO_SOURCES) for name, url in logos.items()):
+        _ingest_in_background(store, logos)
+    return store
+
+
+def main():
+    from catalog import SEED_CATALOG
+
+    parser = argparse.ArgumentParser(description="Ingest tool logos and build static assets.")
+    parser.add_argument('--from', dest='local_dir', default=LOCAL_LOGO_DIR,
+                        help="directory with <tool-slug>.<ext> logos that stand in for the remote fetch")
+    parser.add_argument('--retry', action='store_true', help="refetch tools that only have a placeholder")
+    args = parser.parse_args()
+
+    tools = {name: tool['logo'] for name, tool in SEED_CATALOG['tools'].items()}
+    manifest = ingest_logos(tools, local_dir=args.local_dir, retry_placeholders=args.retry)
+    for tool, filename in sorted(manifest['logos'].items()):
+        note = ' (placeholder)' if tool in manifest['placeholders'] else ''
+        print(f"{tool}: {STATIC_URL}/{filename}{note}")
+    print(f"css: {STATIC_URL}/{manifest['css']}")
+
+
+if __name__ == '__main__':
+    main()
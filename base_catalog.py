@@ -0,0 +1,242 @@
+"""Shared immutable base catalog with per-session copy-on-write overlays.
+
+A BaseCatalog is built once per journal state and shared by every session
+of the process: tools are __slots__ records with tuple fields, and all scores
+live in one ScoreMatrix array (the same one the charts use). A session's
+catalog is a SessionCatalog, which holds only the tools and use cases that
+session has changed. A read-only session costs two empty dicts.
+
+SessionCatalog, and the views it returns for 'tools' and 'use_cases', behave
+like the nested dict they replace, so existing readers are unchanged. Reads
+of a base tool return plain copies of its fields, so mutating a returned
+value never reaches the shared base. Writes go through the views:
+    - assigning a tool or use case stores it in the overlay
+    - deleting one masks it
+    - setdefault() copies a base tool into the overlay on first write, which
+      is how journal.apply_changes() edits nested paths
+"""
+import copy
+import threading
+from collections.abc import Mapping, MutableMapping
+
+from score_matrix import build_score_matrix
+
+TOOL_FIELDS = ('logo', 'strengths', 'weaknesses', 'nuances', 'best_for', 'price', 'scores')
+
+# Marks a base entry the session deleted
+_DELETED = object()
+
+
+def _score(value):
+    return int(value) if value.is_integer() else value
+
+
+class ToolRecord(Mapping):
+    """One base tool, read-only; its scores are a row of the shared score matrix."""
+
+    __slots__ = ('logo', 'strengths', 'weaknesses', 'nuances', 'best_for', 'free', 'paid',
+                 '_matrix', '_row', '_extra')
+
+    def __init__(self, tool, matrix, row):
+        self.logo = tool['logo']
+        self.strengths = tuple(tool['strengths'])
+        self.weaknesses = tuple(tool['weaknesses'])
+        self.nuances = tuple(tool['nuances'])
+        self.best_for = tool['best_for']
+        self.free = tool['price']['free']
+        self.paid = tool['price']['paid']
+        self._matrix = matrix
+        self._row = row
+        # Fields outside the usual schema, kept verbatim (None when there are none)
+        extra = {k: v for k, v in tool.items() if k not in TOOL_FIELDS}
+        self._extra = extra or None
+
+    def __getitem__(self, key):
+        if key in ('strengths', 'weaknesses', 'nuances'):
+            return list(getattr(self, key))
+        if key == 'price':
+            return {'free': self.free, 'paid': self.paid}
+        if key == 'scores':
+            row = self._matrix.values[self._row]
+            return {c: _score(v) for c, v in zip(self._matrix.categories, row.tolist()) if v == v}
+        if key in ('logo', 'best_for'):
+            return getattr(self, key)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from TOOL_FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return len(TOOL_FIELDS) + len(self._extra or ())
+
+    def to_dict(self):
+        tool = {key: self[key] for key in TOOL_FIELDS}
+        if self._extra:
+            tool.update(copy.deepcopy(self._extra))
+        return tool
+
+
+class BaseCatalog:
+    """Immutable catalog shared by all sessions that have not edited it."""
+
+    def __init__(self, data, seq=None):
+        from catalog import data_version
+
+        # The store's edit seq this catalog was read at
+        self.seq = seq
+        self.version = data_version(data)
+        self.matrix = build_score_matrix(data['tools'])
+        self.tools = {name: ToolRecord(tool, self.matrix, row)
+                      for row, (name, tool) in enumerate(data['tools'].items())}
+        self.use_cases = {name: tuple(members) for name, members in data['use_cases'].items()}
+
+
+class _OverlayView(MutableMapping):
+    """Base entries with a session's replacements, additions and deletions on top."""
+
+    def __init__(self, base):
+        self._base = base
+        self._overlay = {}
+
+    def _wrap(self, value):
+        return value
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            value = self._overlay[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        return self._wrap(self._base[key])
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._base:
+            self._overlay[key] = _DELETED
+        else:
+            del self._overlay[key]
+
+    def __iter__(self):
+        for key in self._base:
+            if self._overlay.get(key) is not _DELETED:
+                yield key
+        for key, value in self._overlay.items():
+            if key not in self._base and value is not _DELETED:
+                yield key
+
+    def __len__(self):
+        deleted = sum(1 for v in self._overlay.values() if v is _DELETED)
+        added = sum(1 for key in self._overlay if key not in self._base)
+        return len(self._base) + added - deleted
+
+    def __contains__(self, key):
+        if key in self._overlay:
+            return self._overlay[key] is not _DELETED
+        return key in self._base
+
+    @property
+    def edited(self):
+        return bool(self._overlay)
+
+
+class ToolsView(_OverlayView):
+
+    def __init__(self, base, matrix):
+        super().__init__(base)
+        self._matrix = matrix
+
+    def setdefault(self, key, default=None):
+        """The tool's writable dict, copying a base tool into the overlay first."""
+        value = self._overlay.get(key)
+        if isinstance(value, dict):
+            return value
+        if value is not _DELETED and key in self._base:
+            value = self._overlay[key] = self._base[key].to_dict()
+            return value
+        self._overlay[key] = default
+        return default
+
+    @property
+    def base_matrix(self):
+        """The base score matrix while no tool is changed, else None (see build_score_matrix)."""
+        return None if self._overlay else self._matrix
+
+
+class UseCasesView(_OverlayView):
+
+    def _wrap(self, value):
+        return list(value)
+
+
+class SessionCatalog(Mapping):
+    """A session's catalog: the shared base plus this session's edits."""
+
+    def __init__(self, base):
+        self.base = base
+        self._views = {'tools': ToolsView(base.tools, base.matrix), 'use_cases': UseCasesView(base.use_cases)}
+
+    def __getitem__(self, key):
+        return self._views[key]
+
+    def __iter__(self):
+        return iter(self._views)
+
+    def __len__(self):
+        return len(self._views)
+
+    def setdefault(self, key, default=None):
+        return self._views[key]
+
+    @property
+    def edited(self):
+        return any(view.edited for view in self._views.values())
+
+    @property
+    def version(self):
+        if not self.edited:
+            return self.base.version
+        from catalog import data_version
+
+        return data_version(self.to_dict())
+
+    def to_dict(self):
+        """The catalog as plain nested dicts and lists (JSON-serialisable)."""
+        return {
+            'tools': {name: tool.to_dict() if isinstance(tool, ToolRecord) else tool
+                      for name, tool in self['tools'].items()},
+            'use_cases': {name: list(members) for name, members in self['use_cases'].items()},
+        }
+
+
+def plain_catalog(data):
+    """data as plain dicts, whether it is a SessionCatalog or already a dict."""
+    return data.to_dict() if isinstance(data, SessionCatalog) else data
+
+
+class BaseCatalogSlot:
+    """The process's current base catalog, rebuilt when the journal moves on."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._base = None
+
+    def get(self, journal):
+        return self.refresh(journal)[1]
+
+    def refresh(self, journal):
+        """(previous base, current base), rebuilding if the journal has moved on."""
+        with self._lock:
+            previous = self._base
+            if previous is None or previous.seq != journal.seq:
+                # The store's seq and catalog come from one read, so they always match
+                seq, data = journal.store.catalog()
+                self._base = BaseCatalog(data, seq)
+            return previous, self._base
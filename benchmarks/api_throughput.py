@@ -0,0 +1,100 @@
+"""Throughput benchmark for api.py: requests per second over keep-alive connections.
+
+Starts the API in a subprocess and drives it from this process with raw
+asyncio sockets (so the client stays cheaper than the server), first with
+plain GETs and then with If-None-Match revalidations that get 304s.
+
+    python benchmarks/api_throughput.py --seconds 5 --connections 32
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+PATHS = ['/v1/tools', '/v1/recommend/code-debugging', '/v1/leaders', '/v1/tools/Claude']
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def _connection(port, requests, deadline, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    done = 0
+    try:
+        while time.perf_counter() < deadline:
+            request = requests[done % len(requests)]
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line[:15].lower() == b'content-length:':
+                    length = int(line[15:])
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            done += 1
+    finally:
+        writer.close()
+    return done
+
+
+async def _drive(port, requests, seconds, connections):
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    counts = await asyncio.gather(*(_connection(port, requests, deadline, latencies) for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': sum(counts),
+        'rps': sum(counts) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--connections', type=int, default=32)
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = subprocess.Popen([sys.executable, 'api.py', '--port', str(port)], cwd=REPO_DIR)
+    try:
+        for _ in range(100):
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/v1/version') as response:
+                    etag = response.headers['ETag']
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("api.py did not start")
+
+        modes = {
+            '200 GET': [f'GET {p} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode() for p in PATHS],
+            '304 revalidate': [f'GET {p} HTTP/1.1\r\nHost: localhost\r\nIf-None-Match: {etag}\r\n\r\n'.encode()
+                               for p in PATHS],
+        }
+        for mode, requests in modes.items():
+            result = asyncio.run(_drive(port, requests, args.seconds, args.connections))
+            print(f"{mode:<15} {result['rps']:8.0f} req/s   p50 {result['p50_ms']:6.2f} ms   "
+                  f"p99 {result['p99_ms']:6.2f} ms   ({result['requests']} requests)")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
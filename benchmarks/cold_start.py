@@ -0,0 +1,94 @@
+"""Cold-start benchmark: time to the first rendered page in a fresh process.
+
+Each trial starts a new interpreter, so imports and every process-wide cache
+begin cold, then renders app.py once through AppTest. Two modes are compared:
+
+    cold       the first visitor pays for imports and cache builds (streamlit run app.py)
+    prewarmed  warmup.prewarm() runs first, as serve.py does at server boot
+
+    python benchmarks/cold_start.py --trials 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+MODES = ['cold', 'prewarmed']
+
+
+def child(mode):
+    """One trial, run inside the fresh interpreter; prints a JSON result."""
+    started = time.perf_counter()
+    sys.path.insert(0, str(REPO_DIR))
+    from streamlit.testing.v1 import AppTest
+
+    import journal
+    # Keep trials off the real journal, and start from the seed catalog each time
+    journal.JOURNAL_DIR = Path(tempfile.mkdtemp())
+
+    # AppTest's own one-time setup (component discovery) is not the app's cold start
+    AppTest.from_string("import streamlit as st").run()
+
+    boot = 0.0
+    if mode == 'prewarmed':
+        from warmup import prewarm
+        boot_start = time.perf_counter()
+        prewarm()
+        boot = time.perf_counter() - boot_start
+
+    at = AppTest.from_file(str(REPO_DIR / 'app.py'), default_timeout=120)
+    render_start = time.perf_counter()
+    at.run()
+    first_render = time.perf_counter() - render_start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    print(json.dumps({
+        'import_streamlit_s': render_start - started - boot,
+        'boot_s': boot,
+        'first_render_s': first_render,
+        'pandas_loaded': 'pandas' in sys.modules,
+    }))
+
+
+def run_trial(mode):
+    out = subprocess.run([sys.executable, __file__, '--child', mode], cwd=REPO_DIR,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--output', type=Path, help="also write the results as JSON")
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    results = {}
+    for mode in MODES:
+        trials = [run_trial(mode) for _ in range(args.trials)]
+        results[mode] = {
+            key: statistics.median(t[key] for t in trials)
+            for key in ('import_streamlit_s', 'boot_s', 'first_render_s')
+        }
+        results[mode]['pandas_loaded'] = trials[0]['pandas_loaded']
+        m = results[mode]
+        print(f"{mode:<10} first render {m['first_render_s'] * 1000:7.1f} ms   "
+              f"boot {m['boot_s'] * 1000:7.1f} ms   pandas loaded: {m['pandas_loaded']}", flush=True)
+
+    gain = results['cold']['first_render_s'] - results['prewarmed']['first_render_s']
+    print(f"Pre-warming saves the first visitor {gain * 1000:.1f} ms")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+"""Concurrent-session load test: rerun latency, throughput and memory per session.
+
+Starts app.py under `streamlit run` with a throwaway edit journal and
+telemetry store, then connects simulated users over the same websocket
+protocol the browser uses. The users run in a pool of client processes, so
+the client side is not one event loop competing with itself. Each user loads
+the page and then repeats a random interaction with some think time in
+between:
+
+    task       pick a task in the sidebar task picker (fragment rerun)
+    search     type a query into the sidebar feature search (fragment rerun)
+    filter     change the "Select Tools to Compare" selection
+    priority   pick a priority on the Smart Recommendations tab
+    tab        switch to another tab
+    edit       turn on Edit Mode, open the Edit Data tab, move a score slider
+               and save (journaled, followed by the app's own st.rerun())
+
+Each concurrency level gets a fresh server. For each level the harness
+reports p50/p95/p99 latency (from the rerun request to script_finished),
+reruns per second, and server RSS. RSS is given both as a total and as
+the growth over an idle server, divided by the number of sessions.
+
+    python benchmarks/load_test.py --levels 1 2 4 8 16 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Relative frequency of each interaction in a user's script
+ACTIONS = {'task': 3, 'search': 2, 'filter': 2, 'priority': 3, 'tab': 4, 'edit': 1}
+
+# A rerun that takes longer than this fails the user (reported as an error)
+RERUN_TIMEOUT = 60
+
+SEARCH_QUERIES = ['citations', 'video', 'long doc', 'coding', 'google', 'creative writing', 'screen shar']
+
+SERVER = """\
+import pathlib, sys
+sys.path.insert(0, {repo!r})
+import journal, telemetry
+# Edits and usage events from simulated users stay out of the real stores
+journal.JOURNAL_DIR = pathlib.Path({state!r}) / 'journal'
+telemetry.TELEMETRY_DIR = pathlib.Path({state!r}) / 'telemetry'
+from streamlit.web import cli
+sys.argv = ['streamlit', 'run', {script!r}, '--server.headless=true', '--server.port={port}',
+            '--server.fileWatcherType=none', '--browser.gatherUsageStats=false']
+cli.main()
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_kib(pid):
+    """Resident set size of a process in KiB (Linux /proc)."""
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+class Server:
+    """app.py under `streamlit run` in a subprocess, on a scratch journal."""
+
+    def __init__(self):
+        self.port = _free_port()
+        self.state_dir = tempfile.mkdtemp(prefix='load-test-')
+        code = SERVER.format(repo=str(REPO_DIR), state=self.state_dir,
+                             script=str(REPO_DIR / 'app.py'), port=self.port)
+        self.process = subprocess.Popen([sys.executable, '-c', code], cwd=REPO_DIR,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(300):
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{self.port}/_stcore/health', timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        self.stop()
+        raise RuntimeError("streamlit did not start")
+
+    @property
+    def rss(self):
+        return rss_kib(self.process.pid)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+class Session:
+    """One simulated browser tab speaking Streamlit's websocket protocol."""
+
+    def __init__(self, port):
+        self.url = f'ws://127.0.0.1:{port}/_stcore/stream'
+        self.widgets = {}  # (element type, label) -> (widget id, fragment id, proto)
+        self.tabs = []
+        self.errors = []  # exceptions the app rendered, and timeouts
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    async def rerun(self, states=(), fragment_id=''):
+        """Send one rerun and wait for the script to finish; returns the latency in seconds."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(states)
+        if not fragment_id:
+            # A full rerun re-renders everything; widgets it skips (other tabs) are gone
+            self.widgets.clear()
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await asyncio.wait_for(self.ws.recv(), RERUN_TIMEOUT))
+            kind = fm.WhichOneof('type')
+            if kind == 'delta':
+                self._index(fm.delta)
+            elif kind == 'script_finished':
+                if fm.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - start
+
+    def _index(self, delta):
+        kind = delta.WhichOneof('type')
+        if kind == 'new_element':
+            element = delta.new_element
+            et = element.WhichOneof('type')
+            proto = getattr(element, et)
+            if et == 'exception':
+                self.errors.append(f"{proto.type}: {proto.message}")
+            elif getattr(proto, 'id', '') and hasattr(proto, 'label'):
+                self.widgets[(et, proto.label)] = (proto.id, delta.fragment_id, proto)
+        elif kind == 'add_block':
+            block = delta.add_block
+            if block.WhichOneof('type') == 'tab_container' and block.tab_container.id:
+                self.tab_id = block.tab_container.id
+                self.tabs = []
+            elif block.WhichOneof('type') == 'tab':
+                self.tabs.append(block.tab.label)
+
+    def state(self, et, label, **value):
+        """WidgetState for a widget seen in an earlier rerun (None if it was not rendered)."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        found = self.widgets.get((et, label))
+        if found is None:
+            return None, ''
+        ws = WidgetState(id=found[0])
+        for field, v in value.items():
+            if field.endswith('_array_value'):
+                getattr(ws, field).data[:] = v
+            else:
+                setattr(ws, field, v)
+        return ws, found[1]
+
+    def options(self, et, label):
+        found = self.widgets.get((et, label))
+        return list(found[2].options) if found else []
+
+
+def _tab_state(session, label):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    return WidgetState(id=session.tab_id, string_value=label)
+
+
+async def _act(session, action, rng):
+    """Run one interaction; returns [latency, ...] for the reruns it took."""
+    async def set_widget(et, label, **value):
+        ws, fragment_id = session.state(et, label, **value)
+        if ws is None:
+            return []
+        return [await session.rerun([ws], fragment_id)]
+
+    async def switch_tab(label):
+        return [await session.rerun([_tab_state(session, label)])]
+
+    if action == 'task':
+        options = session.options('selectbox', "What do you need to do?")
+        return await set_widget('selectbox', "What do you need to do?", string_value=rng.choice(options))
+    if action == 'search':
+        return await set_widget('text_input', "Search strengths, weaknesses and features",
+                                string_value=rng.choice(SEARCH_QUERIES))
+    if action == 'filter':
+        options = session.options('multiselect', "Select Tools to Compare")
+        chosen = rng.sample(options, rng.randint(min(2, len(options)), len(options)))
+        return await set_widget('multiselect', "Select Tools to Compare", string_array_value=chosen)
+    if action == 'priority':
+        latencies = []
+        if session.tabs and ('radio', "What matters most for your task?") not in session.widgets:
+            latencies += await switch_tab(session.tabs[0])
+        options = session.options('radio', "What matters most for your task?")
+        return latencies + await set_widget('radio', "What matters most for your task?",
+                                            string_value=rng.choice(options))
+    if action == 'tab':
+        return await switch_tab(rng.choice(session.tabs)) if session.tabs else []
+    if action == 'edit':
+        latencies = await set_widget('checkbox', "Edit Mode", bool_value=True)
+        latencies += await switch_tab(session.tabs[-1])
+        sliders = [label for et, label in session.widgets if et == 'slider']
+        if sliders:
+            slider, _ = session.state('slider', rng.choice(sliders), double_array_value=[rng.randint(0, 10)])
+            save, _ = session.state('button', "💾 Save Changes", trigger_value=True)
+            latencies.append(await session.rerun([slider, save]))
+        latencies += await set_widget('checkbox', "Edit Mode", bool_value=False)
+        return latencies
+    raise ValueError(action)
+
+
+async def _user(port, deadline, think, seed, results):
+    rng = random.Random(seed)
+    session = Session(port)
+    await session.connect()
+    try:
+        results['load'].append(await session.rerun())
+        actions, weights = zip(*ACTIONS.items())
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+            action = rng.choices(actions, weights)[0]
+            results[action].extend(await _act(session, action, rng))
+    except (asyncio.TimeoutError, OSError) as exc:
+        session.errors.append(repr(exc))
+    finally:
+        results['_errors'].extend(session.errors)
+        await session.close()
+
+
+def warm_up(port):
+    """One visit to every tab, so imports and process-wide caches are built before measuring."""
+    async def main():
+        session = Session(port)
+        await session.connect()
+        await session.rerun()
+        for label in list(session.tabs):
+            await session.rerun([_tab_state(session, label)])
+        await session.close()
+
+    asyncio.run(main())
+
+
+def run_users(port, count, duration, think, seed):
+    """Client process: run count users until duration elapses; returns latencies by action."""
+    results = {name: [] for name in ['load', *ACTIONS, '_errors']}
+
+    async def main():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(_user(port, deadline, think, seed + i, results) for i in range(count)))
+
+    asyncio.run(main())
+    return results
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000 if ordered else float('nan')
+
+
+def run_level(sessions, duration, think, processes, seed):
+    server = Server()
+    try:
+        # Measure a server that is already warm, as a live one would be
+        warm_up(server.port)
+        idle_rss = server.rss
+        peak_rss = [idle_rss]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(0.25):
+                peak_rss[0] = max(peak_rss[0], server.rss)
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        workers = min(processes, sessions)
+        shares = [sessions // workers + (i < sessions % workers) for i in range(workers)]
+        started = time.perf_counter()
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(run_users, [server.port] * workers, shares, [duration] * workers,
+                                  [think] * workers, [seed + 1000 * i for i in range(workers)]))
+        elapsed = time.perf_counter() - started
+        done.set()
+        sampler.join()
+        peak_rss[0] = max(peak_rss[0], server.rss)
+    finally:
+        server.stop()
+
+    by_action = {name: [v for part in parts for v in part[name]] for name in parts[0]}
+    errors = by_action.pop('_errors')
+    latencies = sorted(v for values in by_action.values() for v in values)
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'reruns_per_s': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50),
+        'p95_ms': _percentile(latencies, 0.95),
+        'p99_ms': _percentile(latencies, 0.99),
+        'errors': len(errors),
+        'error_samples': sorted(set(errors))[:5],
+        'idle_rss_mib': idle_rss / 1024,
+        'peak_rss_mib': peak_rss[0] / 1024,
+        'rss_per_session_mib': (peak_rss[0] - idle_rss) / 1024 / sessions,
+        'actions': {name: {'count': len(v), 'p50_ms': statistics.median(v) * 1000 if v else None}
+                    for name, v in by_action.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help="concurrent sessions per run")
+    parser.add_argument('--duration', type=float, default=20, help="seconds per level")
+    parser.add_argument('--think', type=float, default=1.0,
+                        help="mean think time between a user's interactions, in seconds (0 = back to back)")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help="client processes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'RSS MiB':>8} {'MiB/session':>11} {'errors':>6}")
+    results = []
+    for sessions in args.levels:
+        r = run_level(sessions, args.duration, args.think, args.processes, args.seed)
+        results.append(r)
+        print(f"{r['sessions']:>8} {r['reruns_per_s']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {r['peak_rss_mib']:>8.1f} {r['rss_per_session_mib']:>11.2f} "
+              f"{r['errors']:>6}", flush=True)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""Headless render benchmarks for app.py, driven through streamlit's AppTest.
+
+Every tab and widget interaction is replayed against synthetic catalogs of
+increasing size. Each result records per-rerun wall time, peak Python memory
+(tracemalloc, measured on a separate run) and the number of elements and
+approximate proto bytes the rerun emitted.
+
+    python benchmarks/render_bench.py                          # full matrix
+    python benchmarks/render_bench.py --tools 4 50 --categories 8 --repeat 3
+    python benchmarks/render_bench.py --compare before.json after.json
+
+Results are written to benchmarks/results/<commit>.json unless --output is given.
+Note that AppTest reruns the whole script for fragment widgets too, so the
+fragment interactions report full-rerun cost.
+"""
+import argparse
+import datetime
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks.synthetic import synthetic_catalog  # noqa: E402
+
+APP_PATH = REPO_DIR / 'app.py'
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+DEFAULT_TOOLS = [4, 50, 500, 5000]
+DEFAULT_CATEGORIES = [8, 100]
+
+SECTIONS = {
+    'recommendations': "🎯 Smart Recommendations",
+    'capabilities': "📊 Capability Analysis",
+    'unique_features': "🔍 Unique Features",
+    'comparison': "📋 Detailed Comparison",
+    'edit_data': "✏️ Edit Data",
+}
+
+
+def _widget(elements, label):
+    return next(e for e in elements if e.label == label)
+
+
+def _open(section):
+    def setup(at):
+        at.session_state['active_section'] = SECTIONS[section]
+    return setup
+
+
+def _noop(at):
+    pass
+
+
+def _set_task(at):
+    _widget(at.sidebar.selectbox, "What do you need to do?").set_value("Code debugging")
+
+
+def _set_priority(at):
+    _widget(at.radio, "What matters most for your task?").set_value("Code Quality")
+
+
+def _set_filter(at):
+    widget = _widget(at.sidebar.multiselect, "Select Tools to Compare")
+    widget.set_value(list(widget.options)[:max(2, len(widget.options) // 2)])
+
+
+def _set_compare(at):
+    widget = _widget(at.multiselect, "Select exactly 2 tools to compare")
+    widget.set_value(list(widget.options)[-2:])
+
+
+def _enable_edit(at):
+    _open('edit_data')(at)
+    _widget(at.toggle, "Edit Mode").set_value(True)
+    at.run()
+
+
+def _save_edit(at):
+    slider = at.slider[0]
+    slider.set_value(10 - slider.value)
+    _widget(at.button, "💾 Save Changes").click()
+
+
+# name -> (setup run before measuring, action whose rerun is measured)
+INTERACTIONS = {
+    'tab:recommendations': (_noop, _open('recommendations')),
+    'tab:capabilities': (_noop, _open('capabilities')),
+    'tab:unique_features': (_noop, _open('unique_features')),
+    'tab:comparison': (_noop, _open('comparison')),
+    'tab:edit_data': (_noop, _open('edit_data')),
+    'sidebar:task': (_noop, _set_task),
+    'sidebar:filter': (_noop, _set_filter),
+    'tab1:priority': (_open('recommendations'), _set_priority),
+    'tab4:compare': (_open('comparison'), _set_compare),
+    'tab6:save': (_enable_edit, _save_edit),
+}
+
+
+def _count_elements(node):
+    """(element count, approximate proto bytes) below an AppTest tree node."""
+    count = size = 0
+    for child in getattr(node, 'children', {}).values():
+        count += 1
+        proto = getattr(child, 'proto', None)
+        if proto is not None and hasattr(proto, 'ByteSize'):
+            size += proto.ByteSize()
+        child_count, child_size = _count_elements(child)
+        count += child_count
+        size += child_size
+    return count, size
+
+
+def _new_app(catalog, timeout):
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    at.session_state['data'] = catalog
+    return at
+
+
+def _prepared_app(catalog, name, timeout):
+    setup, action = INTERACTIONS[name]
+    at = _new_app(catalog, timeout)
+    at.run()
+    setup(at)
+    at.run()
+    return at, action
+
+
+def _check(at, name):
+    if at.exception:
+        raise RuntimeError(f"{name} raised: {at.exception[0].message}")
+
+
+def bench_interaction(catalog, name, repeat, timeout):
+    at, action = _prepared_app(catalog, name, timeout)
+    times = []
+    for _ in range(repeat):
+        action(at)
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        _check(at, name)
+    elements, proto_bytes = _count_elements(at._tree)
+
+    # Peak memory on a separate run so tracemalloc overhead stays out of the timings
+    at, action = _prepared_app(catalog, name, timeout)
+    action(at)
+    tracemalloc.start()
+    at.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _check(at, name)
+
+    return {
+        'median_s': statistics.median(times),
+        'min_s': min(times),
+        'max_s': max(times),
+        'peak_memory_bytes': peak,
+        'elements': elements,
+        'proto_bytes': proto_bytes,
+    }
+
+
+def bench_cold_start(catalog, timeout):
+    at = _new_app(catalog, timeout)
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    _check(at, 'cold start')
+    elements, proto_bytes = _count_elements(at._tree)
+    return {'median_s': elapsed, 'min_s': elapsed, 'max_s': elapsed,
+            'peak_memory_bytes': None, 'elements': elements, 'proto_bytes': proto_bytes}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_suite(tool_counts, category_counts, interactions, repeat, timeout):
+    results = {
+        'commit': _git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'repeat': repeat,
+        'runs': [],
+    }
+    for n_tools in tool_counts:
+        for n_categories in category_counts:
+            catalog = synthetic_catalog(n_tools, n_categories)
+            print(f"== {n_tools} tools x {n_categories} categories", flush=True)
+            measured = {'first_run': bench_cold_start(catalog, timeout)}
+            for name in interactions:
+                measured[name] = bench_interaction(catalog, name, repeat, timeout)
+            for name, m in measured.items():
+                print(f"  {name:<22} {m['median_s'] * 1000:9.1f} ms  {m['elements']:6d} elements"
+                      f"  {m['proto_bytes'] / 1024:9.1f} KiB", flush=True)
+            results['runs'].append({'tools': n_tools, 'categories': n_categories, 'results': measured})
+    return results
+
+
+def compare(old_path, new_path, threshold=0.10):
+    """Print per-interaction median changes; returns True if anything regressed."""
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    old_runs = {(r['tools'], r['categories']): r['results'] for r in old['runs']}
+    regressed = False
+    print(f"{old['commit']} -> {new['commit']}")
+    for run in new['runs']:
+        before = old_runs.get((run['tools'], run['categories']))
+        if before is None:
+            continue
+        print(f"== {run['tools']} tools x {run['categories']} categories")
+        for name, m in run['results'].items():
+            if name not in before:
+                continue
+            was, now = before[name]['median_s'], m['median_s']
+            change = (now - was) / was if was else 0.0
+            flag = ''
+            if change > threshold:
+                flag = '  REGRESSION'
+                regressed = True
+            print(f"  {name:<22} {was * 1000:9.1f} -> {now * 1000:9.1f} ms  {change:+7.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--tools', type=int, nargs='+', default=DEFAULT_TOOLS)
+    parser.add_argument('--categories', type=int, nargs='+', default=DEFAULT_CATEGORIES)
+    parser.add_argument('--only', nargs='+', choices=list(INTERACTIONS), default=list(INTERACTIONS),
+                        help="interactions to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="measured reruns per interaction")
+    parser.add_argument('--timeout', type=float, default=600, help="per-run AppTest timeout in seconds")
+    parser.add_argument('--output', type=Path, help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two results files")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    results = run_suite(args.tools, args.categories, args.only, args.repeat, args.timeout)
+    output = args.output or RESULTS_DIR / f"{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Synthetic catalogs grown from catalog.SEED_CATALOG, for scaling benchmarks."""
+import copy
+import random
+
+from catalog import SEED_CATALOG
+
+BASE_CATEGORIES = ['Writing', 'Coding', 'Research', 'Analysis', 'Creative', 'Conversation', 'Current Info',
+                   'Collaboration']
+
+VOCABULARY = [
+    'citations', 'screen sharing', 'voice mode', 'long context', 'code review', 'image generation',
+    'web search', 'spreadsheets', 'meeting notes', 'translation', 'summaries', 'data analysis',
+    'plugins', 'mobile app', 'API access', 'team workspace', 'file uploads', 'video calls',
+    'academic mode', 'custom agents', 'canvas editing', 'real-time news', 'privacy controls',
+]
+
+ROLES = ['Marketing Teams', 'Data Analysts', 'Content Writers', 'Developers', 'Researchers', 'Project Managers']
+
+
+def _phrases(rng, count):
+    return [f"{rng.choice(['Strong', 'Fast', 'Reliable', 'Basic', 'Limited', 'Best'])} {rng.choice(VOCABULARY)}"
+            for _ in range(count)]
+
+
+def synthetic_catalog(n_tools, n_categories=8, seed=0):
+    """The seed tools plus generated ones, n_tools in total, on n_categories categories.
+
+    The base categories come first so the hard-coded views keep working
+    (below 8 categories, the first n_categories of them); extra categories
+    are named "Category NNN".
+    """
+    if n_categories < 1:
+        raise ValueError(f"need at least one category, got {n_categories}")
+    rng = random.Random(seed)
+    categories = BASE_CATEGORIES[:n_categories] + [
+        f"Category {i + 1:03d}" for i in range(max(0, n_categories - len(BASE_CATEGORIES)))
+    ]
+
+    tools = copy.deepcopy(SEED_CATALOG['tools'])
+    for tool in tools.values():
+        tool['scores'] = {category: tool['scores'][category] if category in tool['scores'] else rng.randint(1, 10)
+                          for category in categories}
+
+    for i in range(len(tools), n_tools):
+        name = f"Tool {i + 1:05d}"
+        tools[name] = {
+            'logo': '',
+            'strengths': _phrases(rng, 6),
+            'weaknesses': _phrases(rng, 4),
+            'nuances': _phrases(rng, 4),
+            'best_for': f"Teams that need {rng.choice(VOCABULARY)} and {rng.choice(VOCABULARY)}",
+            'price': {'free': rng.random() < 0.6, 'paid': rng.choice([0, 10, 20, 25, 30, 50])},
+            'scores': {category: rng.randint(1, 10) for category in categories},
+        }
+
+    return {
+        'tools': tools,
+        'use_cases': {role: rng.sample(list(tools), 3) for role in ROLES},
+    }
@@ -0,0 +1,123 @@
+import html
+from string import Template
+
+import streamlit as st
+
+from versioned_cache import VersionedCache
+
+# Card templates are parsed once at import; rendered cards are memoized per
+# (data version, tool, card kind) so reruns reuse the finished HTML string.
+# Templates must not contain blank lines, which would end the markdown HTML block.
+
+RECOMMENDATION_CARD = Template("""\
+<div class="card" style="border: 2px solid $color;">
+    <h2 style="color: $color;"><img src="$logo" style="width: 30px; height: 30px; vertical-align: middle; margin-right: 8px;"> $name</h2>
+    <p style="font-size: 18px; margin: 15px 0;"><strong>Perfect for:</strong> $best_for</p>
+    <div style="margin: 20px 0;">
+        <h4>Key Advantages:</h4>$strengths
+    </div>
+    <div style="margin: 20px 0;">
+        <h4>Unique Features:</h4>$nuances
+    </div>
+</div>""")
+
+LEADER_CARD = Template("""\
+<div class="card" style="border-left: 4px solid $color;">
+    <div style="font-weight: 600; color: $color; font-size: 14px;">$category</div>
+    <div style="font-size: 20px; margin: 5px 0;">
+        <img src="$logo" style="width: 20px; height: 20px; vertical-align: middle; margin-right: 5px;"> $name
+    </div>
+    <div style="color: #888; font-size: 14px;">Score: $score/10</div>
+</div>""")
+
+FEATURE_CARD = Template("""\
+<div class="feature-card">
+    <div class="feature-card-header"><img src="$logo" width="40"><h3>$name</h3></div>
+    <p><strong>🌟 Unique Features</strong></p>
+    <div>$nuances</div>
+    <p><strong>💡 Best Use Case</strong></p>
+    <div class="note note-info">$best_for</div>
+    <p><strong>💰 Pricing</strong></p>
+    <div class="pricing">
+        <div class="note note-$free_kind">$free_label</div>
+        <div class="note note-warning">Pro: &#36;$paid/mo</div>
+    </div>
+    <hr>
+</div>""")
+
+COMPARISON_CARD = Template("""\
+<div class="card" style="border: 2px solid $color;">
+    <h3 style="color: $color;">
+        <img src="$logo" style="width: 25px; height: 25px; vertical-align: middle; margin-right: 8px;"> $name
+    </h3>
+    <div style="margin: 15px 0;">
+        <h4>✅ Advantages</h4>$strengths
+    </div>
+    <div style="margin: 15px 0;">
+        <h4>⚠️ Limitations</h4>$weaknesses
+    </div>
+    <div style="margin: 15px 0;">
+        <h4>🌟 Unique Features</h4>$nuances
+    </div>
+</div>""")
+
+
+def _items(template, values):
+    return ''.join(template.format(html.escape(str(v))) for v in values)
+
+
+def _pills(values, color, style):
+    return ''.join(
+        f'<span class="nuance-tag" style="background: {color}33; color: {color}; {style}">{html.escape(str(v))}</span>'
+        for v in values
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_card_cache():
+    # Rendered card HTML for every session of this server process
+    return VersionedCache(maxsize=2048, category_kinds=('leader:',))
+
+
+def recommendation_card(version, name, tool, color, logo):
+    return get_card_cache().get(version, (name,), 'recommendation', lambda: RECOMMENDATION_CARD.substitute(
+        name=html.escape(name),
+        color=color,
+        logo=logo,
+        best_for=html.escape(tool['best_for']),
+        strengths=_items('<div style="margin: 8px 0;">✓ {}</div>', tool['strengths'][:3]),
+        nuances=_pills(tool['nuances'][:2], color, 'padding: 4px 8px; margin: 4px; border-radius: 12px; display: inline-block;'),
+    ))
+
+
+def leader_card(version, category, name, score, color, logo):
+    return get_card_cache().get(version, (name,), f'leader:{category}', lambda: LEADER_CARD.substitute(
+        name=html.escape(name),
+        color=color,
+        logo=logo,
+        category=html.escape(category.upper()),
+        score=f"{score:g}",
+    ))
+
+
+def feature_card(version, name, tool, color, logo):
+    return get_card_cache().get(version, (name,), 'feature', lambda: FEATURE_CARD.substitute(
+        name=html.escape(name),
+        logo=logo,
+        nuances=_pills(tool['nuances'], color, 'font-size: inherit; font-weight: normal;'),
+        best_for=html.escape(tool['best_for']),
+        free_kind='success' if tool['price']['free'] else 'error',
+        free_label='Free Tier ✓' if tool['price']['free'] else 'No Free Tier',
+        paid=html.escape(str(tool['price']['paid'])),
+    ))
+
+
+def comparison_card(version, name, tool, color, logo):
+    return get_card_cache().get(version, (name,), 'comparison', lambda: COMPARISON_CARD.substitute(
+        name=html.escape(name),
+        color=color,
+        logo=logo,
+        strengths=_items('<div>• {}</div>', tool['strengths'][:4]),
+        weaknesses=_items('<div>• {}</div>', tool['weaknesses'][:3]),
+        nuances=_items('<div>• {}</div>', tool['nuances'][:2]),
+    ))
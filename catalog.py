@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+
+import streamlit as st
+
+from base_catalog import BaseCatalogSlot, SessionCatalog
+from cards import get_card_cache
+from figures import get_figure_cache
+from journal import changed_tools, get_edit_journal
+from recommender import get_recommender_registry
+from score_matrix import get_score_matrix
+from search import get_search_registry
+
+# Seconds between background checks of the catalog store for other workers' edits
+SYNC_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+# Seed catalog every new session starts from
+SEED_CATALOG = {
+    'tools': {
+        'ChatGPT': {
+            'logo': 'https://cdn.oaistatic.com/_next/static/media/apple-touch-icon.82af6fe1.png',
+            'strengths': ['General tasks', 'Coding with Code Interpreter', 'Creative writing', 'Conversational AI', 'Custom GPTs', 'DALL-E integration'],
+            'weaknesses': ['Can be verbose', 'Knowledge cutoff issues', 'Sometimes hallucinates', 'No native citations'],
+            'nuances': ['Best voice mode', 'Excellent mobile app', 'Strong ecosystem', 'Canvas for editing'],
+            'best_for': 'Creative professionals and general users',
+            'price': {'free': True, 'paid': 20},
+            'scores': {
+                'Writing': 9,
+                'Coding': 9,
+                'Research': 6,
+                'Analysis': 7,
+                'Creative': 10,
+                'Conversation': 10,
+                'Current Info': 5,
+                'Collaboration': 7
+            }
+        },
+        'Claude': {
+            'logo': 'https://www-cdn.anthropic.com/images/claude-app-icon.png',
+            'strengths': ['Long documents (200K tokens)', 'Deep analysis', 'Nuanced writing', 'Code debugging', 'Artifacts feature', 'Projects for context'],
+            'weaknesses': ['No image generation', 'No web search', 'Can be overly cautious', 'Limited integrations'],
+            'nuances': ['Best for long-form content', 'Superior context retention', 'Excellent at following complex instructions', 'Artifacts for iterative work'],
+            'best_for': 'Writers, analysts, and developers working with complex documents',
+            'price': {'free': True, 'paid': 20},
+            'scores': {
+                'Writing': 10,
+                'Coding': 10,
+                'Research': 5,
+                'Analysis': 10,
+                'Creative': 9,
+                'Conversation': 8,
+                'Current Info': 5,
+                'Collaboration': 6
+            }
+        },
+        'Gemini': {
+            'logo': 'https://www.gstatic.com/lamda/images/gemini_favicon_f069958c85030456e93de685481c559f160ea06b.png',
+            'strengths': ['Google integration', 'Multilingual', 'Multimodal', 'Fast responses', 'Best video calls', 'Screen sharing'],
+            'weaknesses': ['Less consistent', 'Smaller community', 'Less refined outputs', 'Limited customization'],
+            'nuances': ['BEST video call & screen sharing features', 'Seamless Google Workspace integration', 'Real-time collaboration', 'YouTube analysis'],
+            'best_for': 'Google users, video meetings, and visual learners',
+            'price': {'free': True, 'paid': 20},
+            'scores': {
+                'Writing': 7,
+                'Coding': 7,
+                'Research': 8,
+                'Analysis': 7,
+                'Creative': 6,
+                'Conversation': 7,
+                'Current Info': 8,
+                'Collaboration': 10
+            }
+        },
+        'Perplexity': {
+            'logo': 'https://www.perplexity.ai/favicon.ico',
+            'strengths': ['Real-time research', 'Source citations', 'Current events', 'Academic mode', 'Focus mode', 'Multiple search engines'],
+            'weaknesses': ['Not creative', 'Limited conversation memory', 'No code execution', 'Basic UI'],
+            'nuances': ['Chats NOT in focus - BEST for pure search', 'Pro searches with multiple models', 'Academic citations', 'Daily news digest'],
+            'best_for': 'Researchers, students, and fact-checkers',
+            'price': {'free': True, 'paid': 20},
+            'scores': {
+                'Writing': 6,
+                'Coding': 5,
+                'Research': 10,
+                'Analysis': 8,
+                'Creative': 3,
+                'Conversation': 5,
+                'Current Info': 10,
+                'Collaboration': 4
+            }
+        }
+    },
+    'use_cases': {
+        'Marketing Teams': ['ChatGPT', 'Claude', 'Perplexity'],
+        'Data Analysts': ['Claude', 'Perplexity', 'Gemini'],
+        'Content Writers': ['Claude', 'ChatGPT', 'Perplexity'],
+        'Developers': ['Claude', 'ChatGPT', 'Gemini'],
+        'Researchers': ['Perplexity', 'Claude', 'Gemini'],
+        'Project Managers': ['Gemini', 'Claude', 'ChatGPT']
+    }
+}
+
+
+def data_version(data):
+    """Content hash of the catalog, used as the cache key for derived views."""
+    if isinstance(data, SessionCatalog):
+        # Precomputed for the shared base; only edited sessions hash their catalog
+        return data.version
+    payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def carry_over_caches(old_version, new_version, tools_data, matrix, changed_tools=(), score_tools=(),
+                      old_categories=None):
+    """Re-key the process caches from old_version to new_version after an edit.
+
+    Cards not involving changed_tools and figures not involving score_tools
+    (tools whose scores changed) are carried over as-is, rankings are updated
+    for score_tools only and the search index re-indexes only changed_tools.
+    If the edit changed the category set (old_categories, when known, differs
+    from matrix.categories), no score figure or leader card is carried over.
+    """
+    categories_changed = old_categories is not None and list(old_categories) != matrix.categories
+    get_card_cache().carry_over(old_version, new_version, changed_tools, categories_changed)
+    get_figure_cache().carry_over(old_version, new_version, score_tools, categories_changed)
+    get_recommender_registry().carry_over(old_version, new_version, matrix, score_tools)
+    get_search_registry().carry_over(old_version, new_version, tools_data, changed_tools)
+
+
+@st.cache_resource(show_spinner=False)
+def get_base_catalog_slot():
+    # One base catalog per server process, shared by all sessions
+    threading.Thread(target=_watch_store, name='catalog-sync', daemon=True).start()
+    return BaseCatalogSlot()
+
+
+def base_catalog():
+    """The shared base catalog for the store's current state, saved from any worker.
+
+    When the base moves on, the process caches carry over every entry the
+    edits in between did not touch (read from the store's edit rows), so an
+    edit on one worker invalidates only what it changed on the others.
+    """
+    journal = get_edit_journal()
+    journal.sync()
+    previous, base = get_base_catalog_slot().refresh(journal)
+    if previous is not None and base is not previous and base.version != previous.version:
+        changes = journal.changes_between(previous.seq, base.seq)
+        if changes is None:
+            # Compaction dropped the edits in between; the caches rebuild for the new version
+            logger.info("Catalog moved to %s; edits not in the log, caches not carried over", base.version)
+        else:
+            changed = [change for edit in changes for change in edit]
+            carry_over_caches(previous.version, base.version, base.tools, base.matrix, *changed_tools(changed),
+                              old_categories=previous.matrix.categories)
+    return base
+
+
+def _watch_store():
+    # Pick up other workers' edits in the background, so new sessions find the
+    # new base (and the carried-over caches) ready
+    while True:
+        time.sleep(SYNC_INTERVAL)
+        try:
+            base_catalog()
+        except Exception:
+            logger.exception("Could not sync the catalog store")
+
+
+def init_session_catalog():
+    # Initialize session state with enhanced data
+    if 'data' not in st.session_state:
+        # A copy-on-write overlay on the journal's catalog (the seed plus every
+        # saved edit); sessions that never edit share the base
+        st.session_state.data = SessionCatalog(base_catalog())
+        st.session_state.journaled = True
+    if 'data_version' not in st.session_state:
+        st.session_state.data_version = data_version(st.session_state.data)
+
+
+def session_tools():
+    return st.session_state.data['tools']
+
+
+def session_score_matrix():
+    """Score matrix for the session's current data version (shared cache)."""
+    return get_score_matrix(st.session_state.data_version, st.session_state.data['tools'])
+
+
+def session_recommender():
+    """Ranking engine for the session's current data version (shared cache)."""
+    return get_recommender_registry().get(st.session_state.data_version, session_score_matrix())
+
+
+def session_search_index():
+    """Full-text search index for the session's current data version (shared cache)."""
+    return get_search_registry().get(st.session_state.data_version, st.session_state.data['tools'])
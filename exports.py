@@ -0,0 +1,120 @@
+import hashlib
+import io
+import json
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+from assets import APP_DIR
+from base_catalog import plain_catalog
+from versioned_cache import VersionedCache
+
+# Export files are written once per data version under a content-hash name in
+# static/exports/, so Streamlit's static route streams them from disk and
+# identical catalogs (across sessions or versions) share one file.
+EXPORT_DIR = APP_DIR / 'static' / 'exports'
+EXPORT_URL = 'app/static/exports'
+
+# Oldest export files beyond this count are removed when a new one is written
+MAX_EXPORT_FILES = 64
+
+
+def catalog_json(data, matrix):
+    return json.dumps(plain_catalog(data), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def scores_csv(data, matrix):
+    frame = matrix.frame()
+    frame.index.name = 'Tool'
+    return frame.to_csv(float_format='%g').encode('utf-8')
+
+
+def tools_parquet(data, matrix):
+    import pandas as pd
+
+    rows = []
+    for name, tool in data['tools'].items():
+        rows.append({
+            'tool': name,
+            'best_for': tool['best_for'],
+            'strengths': tool['strengths'],
+            'weaknesses': tool['weaknesses'],
+            'nuances': tool['nuances'],
+            'free_tier': tool['price']['free'],
+            'pro_price': float(tool['price']['paid']),
+        })
+    frame = pd.DataFrame(rows).set_index('tool').join(matrix.frame())
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer)
+    return buffer.getvalue()
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    label: str
+    ext: str
+    mime: str
+    build: object
+
+
+EXPORT_FORMATS = {
+    'json': ExportFormat("Catalog (JSON)", '.json', 'application/json', catalog_json),
+    'csv': ExportFormat("Score matrix (CSV)", '.csv', 'text/csv', scores_csv),
+    'parquet': ExportFormat("Tools and scores (Parquet)", '.parquet', 'application/vnd.apache.parquet', tools_parquet),
+}
+
+
+@dataclass(frozen=True)
+class ExportArtifact:
+    fmt: str
+    path: Path
+    size: int
+
+    @property
+    def url(self):
+        return f"{EXPORT_URL}/{self.path.name}"
+
+    def read(self):
+        return self.path.read_bytes()
+
+
+def _prune_exports(keep):
+    files = sorted(EXPORT_DIR.glob('*.*'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in files[MAX_EXPORT_FILES:]:
+        if path != keep:
+            path.unlink(missing_ok=True)
+
+
+def write_export(fmt, data, matrix):
+    """Build one export and store it under its content hash; returns the artifact."""
+    spec = EXPORT_FORMATS[fmt]
+    payload = spec.build(data, matrix)
+    path = EXPORT_DIR / f"catalog.{hashlib.sha256(payload).hexdigest()[:16]}{spec.ext}"
+    if not path.exists():
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file of its own first, so a concurrent request (another
+        # session thread or worker) never serves or renames half a file
+        with tempfile.NamedTemporaryFile(dir=EXPORT_DIR, prefix=f".{path.name}.", suffix='.tmp', delete=False) as f:
+            f.write(payload)
+        Path(f.name).replace(path)
+        _prune_exports(path)
+    else:
+        path.touch()
+    return ExportArtifact(fmt, path, len(payload))
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache():
+    # Export files by data version for every session; the files themselves live on disk
+    return VersionedCache(maxsize=32)
+
+
+def export_artifact(fmt, version, data, matrix):
+    """The export file for a data version, built on first request only."""
+    artifact = get_export_cache().get(version, (), fmt, lambda: write_export(fmt, data, matrix))
+    if not artifact.path.exists():
+        # Pruned by another version's export; rebuild it under the same name
+        artifact = write_export(fmt, data, matrix)
+    return artifact
@@ -0,0 +1,276 @@
+import threading
+from collections import Counter
+
+import streamlit as st
+
+from profiler import profile_section
+from versioned_cache import VersionedCache
+
+# MDAA-specific comparison metrics (static, independent of the catalog scores)
+MDAA_METRICS = {
+    'Marketing Content': {'ChatGPT': 10, 'Claude': 8, 'Gemini': 6, 'Perplexity': 4},
+    'Data Analysis': {'ChatGPT': 7, 'Claude': 10, 'Gemini': 7, 'Perplexity': 8},
+    'Market Research': {'ChatGPT': 6, 'Claude': 7, 'Gemini': 7, 'Perplexity': 10},
+    'Report Writing': {'ChatGPT': 8, 'Claude': 10, 'Gemini': 7, 'Perplexity': 6},
+    'Team Collaboration': {'ChatGPT': 7, 'Claude': 6, 'Gemini': 10, 'Perplexity': 4}
+}
+
+STRENGTH_CATEGORIES = ['Writing', 'Coding', 'Research', 'Analysis', 'Creative', 'Current Info']
+
+# Builders import plotly on first use, so importing this module stays cheap and
+# the cost lands on the first figure build (or on the server pre-warm, see serve.py)
+
+# Streamlit's plotly template trimmed to what these figures read, registered
+# with plotly under this name
+TEMPLATE = 'dashboard'
+
+# Above this many tools, grouped bars become a heatmap and the heatmap drops
+# its cell labels; one trace per tool would outweigh the chart itself
+LIGHT_FIGURE_TOOLS = 24
+
+# Shared look of every figure. It goes in each figure's own layout: Streamlit's
+# theme is merged into the template's layout in the browser and would override it
+STYLE = dict(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=400, font=dict(color='white'))
+GRID = 'rgba(255,255,255,0.1)'
+POLAR_GRID = 'rgba(255,255,255,0.2)'
+
+
+def _template():
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    if TEMPLATE not in pio.templates:
+        # Every trace sets its own colors and the heatmaps their colorscale, so
+        # of Streamlit's template (3.6 KB in every figure) only the colorway is
+        # kept; the browser still maps it to the theme's palette
+        pio.templates[TEMPLATE] = go.layout.Template(layout=dict(colorway=pio.templates['streamlit'].layout.colorway))
+    return TEMPLATE
+
+
+def _figure():
+    import plotly.graph_objects as go
+
+    return go.Figure(layout=dict(template=_template(), **STYLE))
+
+
+def compact(values):
+    """Scores as the smallest typed array plotly can encode: int8 when whole, else float32."""
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    if np.isfinite(values).all() and (values == np.round(values)).all() and np.abs(values).max(initial=0) < 128:
+        return values.astype(np.int8)
+    return values.astype(np.float32)
+
+
+def radar_figure(matrix, tools, colors):
+    import plotly.graph_objects as go
+
+    categories = matrix.categories
+    fig = _figure()
+
+    for tool_name, scores in zip(tools, matrix.scores(tools)):
+        fig.add_trace(go.Scatterpolar(
+            r=compact(scores),
+            theta=categories,
+            fill='toself',
+            name=tool_name,
+            line=dict(color=colors[tool_name], width=3),
+            fillcolor=colors[tool_name],
+            opacity=0.25
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, 10], gridcolor=POLAR_GRID),
+            angularaxis=dict(gridcolor=POLAR_GRID)
+        ),
+        showlegend=True
+    )
+    return fig
+
+
+def _score_heatmap(tools, columns, values, labels, x_title):
+    # One heatmap trace for a tools x columns score block, also the light form of the bar charts
+    import plotly.graph_objects as go
+
+    light = len(tools) > LIGHT_FIGURE_TOOLS
+    fig = _figure()
+    fig.add_trace(go.Heatmap(
+        z=compact(values),
+        x=list(columns),
+        y=list(tools),
+        # A shared color axis, so Streamlit's theme styles the colorbar
+        coloraxis='coloraxis',
+        # Cell labels are drawn per cell; past a few dozen rows they are unreadable anyway
+        texttemplate=None if light else '%{z}',
+        hovertemplate=f"{labels}: %{{x}}<br>AI Tool: %{{y}}<br>Score: %{{z}}<extra></extra>",
+    ))
+    fig.update_layout(
+        coloraxis=dict(colorscale='Viridis', colorbar=dict(title="Score")),
+        xaxis=dict(title=x_title),
+        yaxis=dict(title="AI Tool", autorange='reversed'),
+        margin=dict(t=60),
+        font=dict(size=12)
+    )
+    if light:
+        fig.update_layout(height=min(400 + 12 * (len(tools) - LIGHT_FIGURE_TOOLS), 1200))
+    return fig
+
+
+def heatmap_figure(matrix, tools, colors):
+    return _score_heatmap(tools, matrix.categories, matrix.scores(tools), "Capability", "Capability")
+
+
+def strengths_figure(matrix, tools, colors):
+    import plotly.graph_objects as go
+
+    scores = matrix.scores(tools, STRENGTH_CATEGORIES, fill=0)
+    if len(tools) > LIGHT_FIGURE_TOOLS:
+        return _score_heatmap(tools, STRENGTH_CATEGORIES, scores, "Capability", None)
+
+    fig = _figure()
+
+    for tool, tool_scores in zip(tools, scores):
+        fig.add_trace(go.Bar(
+            name=tool,
+            x=STRENGTH_CATEGORIES,
+            y=compact(tool_scores),
+            marker_color=colors[tool],
+            # Labels as short strings; they also show in the hover label
+            text=[f'{score:g}' for score in tool_scores],
+            textposition='outside'
+        ))
+
+    fig.update_layout(
+        barmode='group',
+        yaxis=dict(range=[0, 11], gridcolor=GRID),
+        xaxis=dict(gridcolor=GRID)
+    )
+    return fig
+
+
+def mdaa_figure(matrix, tools, colors):
+    import plotly.graph_objects as go
+
+    metrics = list(MDAA_METRICS)
+    scores = [[MDAA_METRICS[metric].get(tool, 5) for metric in metrics] for tool in tools]
+    if len(tools) > LIGHT_FIGURE_TOOLS:
+        fig = _score_heatmap(tools, metrics, scores, "Use Case", "Use Case")
+        fig.update_layout(title="MDAA Team-Specific Performance Scores")
+        return fig
+
+    fig = _figure()
+
+    for tool, tool_scores in zip(tools, scores):
+        fig.add_trace(go.Bar(
+            name=tool,
+            x=metrics,
+            y=compact(tool_scores),
+            marker_color=colors[tool],
+            # Labels as short strings; they also show in the hover label
+            text=[f'{score:g}' for score in tool_scores],
+            textposition='outside'
+        ))
+
+    fig.update_layout(
+        title="MDAA Team-Specific Performance Scores",
+        barmode='group',
+        yaxis=dict(range=[0, 11], gridcolor=GRID, title="Score"),
+        xaxis=dict(gridcolor=GRID, title="Use Case")
+    )
+    return fig
+
+
+def trend_figure(series, category, colors):
+    """Step lines of one category's score over time; series comes from ScoreHistory.series()."""
+    import plotly.graph_objects as go
+
+    fig = _figure()
+
+    for tool, (timestamps, scores) in series.items():
+        fig.add_trace(go.Scatter(
+            x=(timestamps * 1000).astype('datetime64[ms]'),
+            y=scores.astype('float32'),
+            mode='lines',
+            name=tool,
+            line=dict(color=colors[tool], width=3, shape='hv')
+        ))
+
+    fig.update_layout(
+        title=f"{category} score over time",
+        yaxis=dict(range=[0, 10.5], gridcolor=GRID, title="Score"),
+        xaxis=dict(gridcolor=GRID)
+    )
+    return fig
+
+
+BUILDERS = {
+    'radar': radar_figure,
+    'heatmap': heatmap_figure,
+    'strengths': strengths_figure,
+    'mdaa': mdaa_figure,
+}
+
+# Figure kinds that do not read the catalog scores, so edits never invalidate them
+STATIC_KINDS = {'mdaa'}
+
+# Figure kinds with a trace, axis or column per category
+CATEGORY_KINDS = ('radar', 'heatmap', 'strengths')
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    # Figures for every session of this server process; edits re-key them with carry_over
+    return VersionedCache(maxsize=64, static_kinds=STATIC_KINDS, category_kinds=CATEGORY_KINDS)
+
+
+def cached_figure(kind, version, matrix, tools, colors):
+    def build():
+        # Shows up in the profile panel only on a cache miss
+        with profile_section(f"Build figure: {kind}"):
+            return BUILDERS[kind](matrix, tools, colors)
+
+    return get_figure_cache().get(version, tools, kind, build)
+
+
+def payload_bytes(fig):
+    """Size of the figure's JSON as st.plotly_chart sends it, measured once per figure object."""
+    size = getattr(fig, '_payload_bytes', None)
+    if size is None:
+        import plotly.io as pio
+
+        size = fig._payload_bytes = len(pio.to_json(fig, validate=False).encode('utf-8'))
+    return size
+
+
+class FigureStats:
+    """Figure payload bytes sent to browsers, per figure kind."""
+
+    def __init__(self):
+        self.sends = Counter()
+        self.bytes = Counter()
+        self.last = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, size):
+        with self._lock:
+            self.sends[kind] += 1
+            self.bytes[kind] += size
+            self.last[kind] = size
+
+    def rows(self):
+        with self._lock:
+            return [(kind, self.sends[kind], self.bytes[kind], self.last[kind]) for kind in self.sends]
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_stats():
+    # One tally per server process, shown in the sidebar's admin usage panel
+    return FigureStats()
+
+
+def plot_figure(kind, fig):
+    """Send a figure with Streamlit's theme and record its payload size."""
+    get_figure_stats().record(kind, payload_bytes(fig))
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,328 @@
+"""Streaming catalog import from JSON, JSON Lines and CSV.
+
+Files are parsed record by record and every tool is validated on its own, so
+one bad row doesn't sink the whole import; only the validated records are
+kept in memory until they are merged into the catalog in one batch.
+
+    JSON   the export shape: {"tools": {name: tool, ...}, "use_cases": {...}}
+    JSONL  one object per line: a tool with a "name" key, or
+           {"use_case": name, "tools": [...]}
+    CSV    name, logo, best_for, strengths, weaknesses, nuances, free, paid,
+           then one column per score category; list cells are "|"-separated
+"""
+import csv
+import io
+import json
+import math
+from dataclasses import dataclass, field
+
+SCORE_RANGE = (0, 10)
+LIST_FIELDS = ('strengths', 'weaknesses', 'nuances')
+TOOL_FIELDS = {'logo', 'best_for', 'price', 'scores'} | set(LIST_FIELDS)
+CSV_COLUMNS = ('name', 'logo', 'best_for') + LIST_FIELDS + ('free', 'paid')
+CSV_LIST_SEPARATOR = '|'
+
+# Keep at most this many error messages per import
+MAX_ERRORS = 50
+
+# JSON is read in chunks of this many characters
+CHUNK_SIZE = 64 * 1024
+
+FORMATS = {
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+}
+
+
+class RecordError(ValueError):
+    """A single import record that doesn't match the tool schema."""
+
+
+@dataclass
+class ImportResult:
+    tools: dict = field(default_factory=dict)
+    use_cases: dict = field(default_factory=dict)
+    records: int = 0
+    rejected: int = 0
+    errors: list = field(default_factory=list)
+
+    def reject(self, where, message):
+        self.rejected += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{where}: {message}")
+
+
+def detect_format(filename):
+    suffix = filename[filename.rfind('.'):].lower() if '.' in filename else ''
+    if suffix not in FORMATS:
+        raise ValueError(f"Unsupported file type '{suffix or filename}' (use .json, .jsonl or .csv)")
+    return FORMATS[suffix]
+
+
+def _integral(value, name):
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        raise RecordError(f"{name} must be a number, got {value!r}")
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            raise RecordError(f"{name} must be a number, got {value!r}") from None
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise RecordError(f"{name} must be a number, got {value!r}")
+    return int(value) if float(value).is_integer() else value
+
+
+def _flag(value, name):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', 'yes', '1', 'false', 'no', '0'):
+        return value.strip().lower() in ('true', 'yes', '1')
+    if value in (0, 1):
+        return bool(value)
+    raise RecordError(f"{name} must be true or false, got {value!r}")
+
+
+def _text_list(value, name):
+    if not isinstance(value, list):
+        raise RecordError(f"{name} must be a list of strings")
+    items = []
+    for v in value:
+        if not isinstance(v, str):
+            raise RecordError(f"{name} must be a list of strings")
+        v = v.strip()
+        if v:
+            items.append(v)
+    return items
+
+
+def validate_tool(name, record):
+    """Normalized copy of one tool record; raises RecordError if it doesn't fit the schema."""
+    if not isinstance(name, str) or not name.strip():
+        raise RecordError("tool name must be a non-empty string")
+    if not isinstance(record, dict):
+        raise RecordError("tool must be an object")
+    unknown = set(record) - TOOL_FIELDS
+    if unknown:
+        raise RecordError(f"unknown fields {', '.join(sorted(unknown))}")
+
+    best_for = record.get('best_for')
+    if not isinstance(best_for, str) or not best_for.strip():
+        raise RecordError("best_for must be a non-empty string")
+    logo = record.get('logo', '')
+    if not isinstance(logo, str):
+        raise RecordError("logo must be a string")
+
+    price = record.get('price')
+    if not isinstance(price, dict) or set(price) != {'free', 'paid'}:
+        raise RecordError("price must be an object with 'free' and 'paid'")
+    paid = _integral(price['paid'], 'price.paid')
+    if paid < 0:
+        raise RecordError("price.paid must not be negative")
+
+    scores = record.get('scores')
+    if not isinstance(scores, dict) or not scores:
+        raise RecordError("scores must be a non-empty object")
+    clean_scores = {}
+    for category, score in scores.items():
+        score = _integral(score, f"scores.{category}")
+        if not isinstance(score, int) or not SCORE_RANGE[0] <= score <= SCORE_RANGE[1]:
+            raise RecordError(f"scores.{category} must be a whole number from {SCORE_RANGE[0]} to {SCORE_RANGE[1]}")
+        clean_scores[category] = score
+
+    return name.strip(), {
+        'logo': logo,
+        'best_for': best_for.strip(),
+        'strengths': _text_list(record.get('strengths', []), 'strengths'),
+        'weaknesses': _text_list(record.get('weaknesses', []), 'weaknesses'),
+        'nuances': _text_list(record.get('nuances', []), 'nuances'),
+        'price': {'free': _flag(price['free'], 'price.free'), 'paid': paid},
+        'scores': clean_scores,
+    }
+
+
+def _validate_use_case(name, tools):
+    if not isinstance(name, str) or not name.strip():
+        raise RecordError("use case name must be a non-empty string")
+    if not isinstance(tools, list) or not all(isinstance(t, str) for t in tools):
+        raise RecordError("use case tools must be a list of tool names")
+    return name.strip(), tools
+
+
+class _JsonStream:
+    """Walks a JSON document in chunks, decoding one value at a time."""
+
+    def __init__(self, text_stream):
+        self._stream = text_stream
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        chunk = self._stream.read(CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _skip_space(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def peek(self):
+        self._skip_space()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Invalid JSON: expected '{char}'")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete value, reading more chunks until it fits."""
+        self._skip_space()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._eof or not self._fill():
+                    raise ValueError(f"Invalid JSON: {exc.msg}") from None
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def members(self):
+        """(key, position) for each member of the object starting here; the caller reads the value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid JSON: object keys must be strings")
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self._pos += 1
+                continue
+            self.expect('}')
+            return
+
+
+def _json_records(text_stream):
+    stream = _JsonStream(text_stream)
+    for key in stream.members():
+        if key in ('tools', 'use_cases'):
+            kind = 'tool' if key == 'tools' else 'use_case'
+            for name in stream.members():
+                yield kind, f"{key}.{name}", name, stream.value()
+        else:
+            stream.value()
+
+
+def _jsonl_records(text_stream):
+    for line_number, line in enumerate(text_stream, 1):
+        if not line.strip():
+            continue
+        where = f"line {line_number}"
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield 'error', where, None, f"invalid JSON ({exc.msg})"
+            continue
+        if isinstance(record, dict) and 'use_case' in record:
+            yield 'use_case', where, record.get('use_case'), record.get('tools')
+        elif isinstance(record, dict):
+            record = dict(record)
+            yield 'tool', where, record.pop('name', None), record
+        else:
+            yield 'error', where, None, "expected an object"
+
+
+def _csv_records(text_stream):
+    reader = csv.DictReader(text_stream)
+    missing = [c for c in ('name', 'best_for', 'free', 'paid') if c not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+    categories = [c for c in reader.fieldnames if c not in CSV_COLUMNS]
+    for row in reader:
+        where = f"line {reader.line_num}"
+        record = {
+            'logo': row.get('logo') or '',
+            'best_for': row['best_for'] or '',
+            'price': {'free': row['free'] or '', 'paid': row['paid'] or ''},
+            # Empty score cells mean the tool has no score for that category
+            'scores': {c: row[c] for c in categories if row.get(c) not in (None, '')},
+        }
+        for name in LIST_FIELDS:
+            record[name] = (row.get(name) or '').split(CSV_LIST_SEPARATOR)
+        yield 'tool', where, row['name'], record
+
+
+READERS = {
+    'json': _json_records,
+    'jsonl': _jsonl_records,
+    'csv': _csv_records,
+}
+
+
+def read_catalog(binary_stream, fmt):
+    """Parse and validate an uploaded file; raises ValueError if the file itself is unreadable."""
+    binary_stream.seek(0)
+    text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    result = ImportResult()
+    try:
+        for kind, where, name, payload in READERS[fmt](text_stream):
+            result.records += 1
+            try:
+                if kind == 'error':
+                    raise RecordError(payload)
+                if kind == 'tool':
+                    name, tool = validate_tool(name, payload)
+                    result.tools[name] = tool
+                else:
+                    name, tools = _validate_use_case(name, payload)
+                    result.use_cases[name] = tools
+            except RecordError as exc:
+                result.reject(where, exc)
+    except UnicodeDecodeError:
+        raise ValueError("File is not valid UTF-8") from None
+    finally:
+        text_stream.detach()
+    return result
+
+
+def merge_import(data, result):
+    """Merge validated records into the catalog in place.
+
+    Returns (changed tools, tools whose scores changed). Use cases naming
+    tools that are in neither the catalog nor the import are rejected and
+    dropped from result.use_cases.
+    """
+    tools = data['tools']
+    changed = [name for name, tool in result.tools.items() if tools.get(name) != tool]
+    score_changed = [name for name in changed if name not in tools or tools[name]['scores'] != result.tools[name]['scores']]
+    for name in changed:
+        tools[name] = result.tools[name]
+
+    for name, members in list(result.use_cases.items()):
+        unknown = [t for t in members if t not in tools]
+        if unknown:
+            result.reject(f"use_cases.{name}", f"unknown tools {', '.join(unknown)}")
+            del result.use_cases[name]
+        else:
+            data['use_cases'][name] = members
+    return changed, score_changed
@@ -0,0 +1,308 @@
+"""Edit journal with undo/redo, kept in the SQLite catalog store.
+
+Every saved edit is one row in the store's edits table holding only the
+values it changed, as (path, before, after) triples such as
+['tools', 'Claude', 'scores', 'Coding']. The same transaction updates the
+catalog rows those paths point at (see store.py), so a save touches a few rows
+and never rewrites the catalog. Once enough edits pile up, the undo/redo
+stacks are checkpointed and the older edit rows are dropped, in a background
+thread so the save that crosses the threshold does not wait for it.
+
+The journal is shared by every session of the server process, and the store by
+every worker process: sessions start from its current catalog, and undo/redo
+step through edits from any session on any worker.
+A journal folder from before the store (snapshot.json plus journal.jsonl) is
+migrated into it on first open.
+"""
+import copy
+import json
+import threading
+from collections.abc import Mapping
+
+import streamlit as st
+
+from assets import APP_DIR
+from score_history import ScoreHistory, catalog_points, score_points
+from store import CatalogStore, StaleSeq
+
+JOURNAL_DIR = APP_DIR / 'journal'
+
+# Checkpoint once this many edits have been appended since the last checkpoint
+COMPACT_AFTER = 100
+
+# Undo/redo depth kept in memory and in checkpoints
+MAX_UNDO = 50
+
+
+class _Missing:
+    def __repr__(self):
+        return 'MISSING'
+
+
+# Marks a value that didn't exist (before a value was added, or after it was removed)
+MISSING = _Missing()
+
+
+def diff_changes(path, before, after):
+    """Change list turning before into after at path, descending into dicts."""
+    if isinstance(before, Mapping) and isinstance(after, Mapping):
+        changes = []
+        for key in list(before) + [k for k in after if k not in before]:
+            changes.extend(diff_changes(path + [key], before.get(key, MISSING), after.get(key, MISSING)))
+        return changes
+    if before is MISSING and after is MISSING or before == after:
+        return []
+    return [(list(path), before, after)]
+
+
+def apply_changes(data, changes):
+    """Set (or remove) every changed path in data to its after value, in place.
+
+    setdefault() is what copies a shared base tool into a session's overlay
+    (see base_catalog.py) before its nested values are written.
+    """
+    for path, _, value in changes:
+        parent = data
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        if value is MISSING:
+            parent.pop(path[-1], None)
+        else:
+            parent[path[-1]] = copy.deepcopy(value)
+
+
+def changed_tools(changes):
+    """(tools touched, tools whose scores were touched) by a change list."""
+    tools, score_tools = [], []
+    for path, _, _ in changes:
+        if path[0] == 'tools' and len(path) > 1:
+            tools.append(path[1])
+            if len(path) == 2 or path[2] == 'scores':
+                score_tools.append(path[1])
+    return list(dict.fromkeys(tools)), list(dict.fromkeys(score_tools))
+
+
+def _encode(changes):
+    encoded = []
+    for path, before, after in changes:
+        change = {'path': path}
+        if before is not MISSING:
+            change['before'] = before
+        if after is not MISSING:
+            change['after'] = after
+        encoded.append(change)
+    return encoded
+
+
+def _decode(encoded):
+    return [(c['path'], c.get('before', MISSING), c.get('after', MISSING)) for c in encoded]
+
+
+class EditJournal:
+    """Undo/redo stacks over a CatalogStore, rebuilt from its checkpoint plus later edits.
+
+    Several server processes can share one store. Each keeps its own stacks
+    and catches up on the others' edits before changing anything, so undo
+    always reverts the latest edit from any worker.
+    """
+
+    def __init__(self, store, history=None):
+        self.store = store
+        # ScoreHistory that gets a point for every score an edit, undo or redo sets
+        self.history = history
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._compacting = None
+        self._load_checkpoint()
+        self._catch_up()
+
+    def _load_checkpoint(self):
+        checkpoint = self.store.checkpoint()
+        self.seq = checkpoint['seq']
+        self._undo = [_decode(c) for c in checkpoint['undo']]
+        self._redo = [_decode(c) for c in checkpoint['redo']]
+
+    def _catch_up(self):
+        # Step the stacks through edits saved since we last looked, by any worker
+        edits = self.store.edits_after(self.seq)
+        if edits and edits[0][0] != self.seq + 1 or not edits and self.store.seq() > self.seq:
+            # Another worker checkpointed past our position; restart from its checkpoint
+            self._load_checkpoint()
+            edits = self.store.edits_after(self.seq)
+        for seq, op, changes in edits:
+            self._replay(seq, op, _decode(changes))
+
+    def _replay(self, seq, op, changes):
+        if op == 'edit':
+            self._undo.append(changes)
+            self._redo.clear()
+        elif op == 'undo':
+            self._redo.append(self._undo.pop())
+        else:
+            self._undo.append(self._redo.pop())
+        del self._undo[:-MAX_UNDO]
+        self.seq = seq
+        self._pending += 1
+
+    def _step(self, next_step):
+        # next_step() -> (op, changes) from the caught-up stacks, or None
+        with self._lock:
+            while True:
+                self._catch_up()
+                step = next_step()
+                if step is None:
+                    return None
+                op, changes = step
+                encoded = _encode(changes)
+                try:
+                    seq = self.store.append(op, encoded, expected_seq=self.seq)
+                except StaleSeq:
+                    # Another worker saved in between; catch up and work out the step again
+                    continue
+                # Keep a decoded copy, so the journal never shares objects with a session's catalog
+                self._replay(seq, op, _decode(json.loads(json.dumps(encoded))))
+                if self._pending >= COMPACT_AFTER and self._compacting is None:
+                    self._compacting = threading.Thread(target=self.compact, name='journal-compaction', daemon=True)
+                    self._compacting.start()
+                break
+        # The edit is saved; its history points (one per score, thousands for an
+        # import) are written without holding up other saves or syncs
+        if self.history is not None:
+            self.history.append(score_points(changes))
+        return changes
+
+    def record(self, changes):
+        """Journal one edit; changes come from diff_changes."""
+        if changes:
+            self._step(lambda: ('edit', changes))
+
+    def undo(self):
+        """Revert the latest edit; returns the change list to undo on a session's copy, or None."""
+        def next_step():
+            if self._undo:
+                return 'undo', [(path, after, before) for path, before, after in reversed(self._undo[-1])]
+        return self._step(next_step)
+
+    def redo(self):
+        """Re-apply the latest undone edit; returns its change list, or None."""
+        return self._step(lambda: ('redo', self._redo[-1]) if self._redo else None)
+
+    def sync(self):
+        """Catch up on edits other workers saved; returns the current seq."""
+        with self._lock:
+            self._catch_up()
+            return self.seq
+
+    def changes_between(self, start, end):
+        """Change lists of the edits after seq start up to end, or None once compaction dropped them."""
+        edits = [e for e in self.store.edits_after(start) if e[0] <= end]
+        if [seq for seq, _, _ in edits] != list(range(start + 1, end + 1)):
+            return None
+        return [_decode(changes) for _, _, changes in edits]
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def catalog(self):
+        """A private copy of the current catalog for a new session."""
+        return self.store.catalog()[1]
+
+    def compact(self):
+        """Checkpoint the undo/redo stacks and drop the edit rows before them."""
+        try:
+            with self._lock:
+                seq, pending = self.seq, self._pending
+                undo = [_encode(c) for c in self._undo]
+                redo = [_encode(c) for c in self._redo]
+            # The store write happens outside the lock; edits keep being saved meanwhile
+            self.store.compact(seq, undo, redo)
+            with self._lock:
+                self._pending -= pending
+        finally:
+            self._compacting = None
+
+    def __len__(self):
+        return self._pending
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(directory=None):
+    """The directory's catalog store (one per process), seeded on first use."""
+    directory = directory or JOURNAL_DIR
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = CatalogStore(directory / 'catalog.db')
+            if store.is_empty():
+                _seed(store, directory)
+        return store
+
+
+def _seed(store, directory):
+    from catalog import SEED_CATALOG
+
+    snapshot_path = directory / 'snapshot.json'
+    journal_path = directory / 'journal.jsonl'
+    if not snapshot_path.exists() and not journal_path.exists():
+        store.seed(SEED_CATALOG)
+        return
+
+    # Fold a pre-store journal folder into the store, undo history included
+    data, undo, redo = copy.deepcopy(SEED_CATALOG), [], []
+    seq = 0
+    if snapshot_path.exists():
+        snapshot = json.loads(snapshot_path.read_text(encoding='utf-8'))
+        data, seq, undo, redo = snapshot['data'], snapshot['seq'], snapshot['undo'], snapshot['redo']
+    if journal_path.exists():
+        with open(journal_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-append; everything before it is intact
+                    break
+                if entry['seq'] <= seq:
+                    continue
+                apply_changes(data, _decode(entry['changes']))
+                if entry['op'] == 'edit':
+                    undo.append(entry['changes'])
+                    redo.clear()
+                elif entry['op'] == 'undo':
+                    redo.append(undo.pop())
+                else:
+                    undo.append(redo.pop())
+                del undo[:-MAX_UNDO]
+    store.seed(data)
+    store.compact(0, undo, redo)
+    for path in (snapshot_path, journal_path):
+        if path.exists():
+            path.rename(path.with_name(path.name + '.migrated'))
+
+
+@st.cache_resource(show_spinner=False)
+def get_edit_journal():
+    # One journal per server process, shared by all sessions
+    history = ScoreHistory(JOURNAL_DIR / 'history')
+    journal = EditJournal(open_store(JOURNAL_DIR), history)
+    if not len(history):
+        # Start the history from the current scores, so every trend has a first point
+        history.seed(catalog_points(journal.catalog()))
+    return journal
+
+
+def read_catalog(directory=None):
+    """The store's current catalog, read fresh from disk (for other processes)."""
+    return open_store(directory).catalog()[1]
+
+
+def journal_stamp(directory=None):
+    """Sequence number of the latest saved edit; changes whenever an edit is saved."""
+    return open_store(directory).seq()
@@ -0,0 +1,147 @@
+"""Hot-path profiler for app.py, toggled per session from the sidebar.
+
+While a profiled rerun is active, every ForwardMsg the script sends goes
+through a counting hook, and profile_section() / @profiled record the wall
+time, delta count and approximate payload bytes of the code they wrap.
+Sections nest; a parent's figures include its children. Fragment-only reruns
+are not profiled.
+"""
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Profiled reruns kept per session
+HISTORY_SIZE = 20
+
+_ACTIVE_KEY = '_profile_run'
+_HISTORY_KEY = '_profile_history'
+
+
+@dataclass
+class Section:
+    name: str
+    depth: int
+    seconds: float
+    deltas: int
+    bytes: int
+
+
+@dataclass
+class RerunProfile:
+    started: float = field(default_factory=time.time)
+    sections: list = field(default_factory=list)
+    deltas: int = 0
+    bytes: int = 0
+    depth: int = 0
+    seconds: float = 0.0
+    _start: float = field(default_factory=time.perf_counter)
+
+
+def _install_hook(run):
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    # A previous run that raised before finish_profiling() may have left its hook
+    original = getattr(ctx, '_profile_original_enqueue', ctx._enqueue)
+
+    def counting_enqueue(msg):
+        if msg.WhichOneof('type') == 'delta':
+            run.deltas += 1
+            run.bytes += msg.ByteSize()
+        original(msg)
+
+    ctx._profile_original_enqueue = original
+    ctx._enqueue = counting_enqueue
+
+
+def _remove_hook():
+    ctx = get_script_run_ctx()
+    if ctx is not None and hasattr(ctx, '_profile_original_enqueue'):
+        ctx._enqueue = ctx._profile_original_enqueue
+        del ctx._profile_original_enqueue
+
+
+def start_profiling(enabled):
+    """Begin profiling this rerun if enabled; call first thing in the script."""
+    _remove_hook()
+    st.session_state.pop(_ACTIVE_KEY, None)
+    if enabled:
+        run = st.session_state[_ACTIVE_KEY] = RerunProfile()
+        _install_hook(run)
+
+
+def finish_profiling():
+    """Stop profiling and add the rerun to the session's history; returns it (or None)."""
+    _remove_hook()
+    run = st.session_state.pop(_ACTIVE_KEY, None)
+    if run is not None:
+        run.seconds = time.perf_counter() - run._start
+        st.session_state.setdefault(_HISTORY_KEY, deque(maxlen=HISTORY_SIZE)).append(run)
+    return run
+
+
+@contextmanager
+def profile_section(name):
+    run = st.session_state.get(_ACTIVE_KEY)
+    if run is None:
+        yield
+        return
+    index = len(run.sections)
+    run.sections.append(None)  # keeps sections in start order when they nest
+    depth = run.depth
+    run.depth += 1
+    deltas, size, start = run.deltas, run.bytes, time.perf_counter()
+    try:
+        yield
+    finally:
+        run.depth = depth
+        run.sections[index] = Section(name, depth, time.perf_counter() - start,
+                                      run.deltas - deltas, run.bytes - size)
+
+
+def profiled(name):
+    """Decorator form of profile_section()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profile_section(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def profile_history():
+    return list(st.session_state.get(_HISTORY_KEY, ()))
+
+
+def _slowest(run):
+    top = [s for s in run.sections if s is not None and s.depth == 0]
+    return max(top, key=lambda s: s.seconds).name if top else ''
+
+
+def render_profile_panel(run):
+    """Collapsible panel with the finished rerun's sections and the session's history."""
+    import pandas as pd
+
+    with st.expander(f"⏱️ Profile: {run.seconds * 1000:.0f} ms, {run.deltas} deltas, "
+                     f"{run.bytes / 1024:.1f} KiB", expanded=False):
+        st.dataframe(pd.DataFrame([{
+            'Section': '\u2003' * s.depth + s.name,
+            'ms': round(s.seconds * 1000, 1),
+            'Deltas': s.deltas,
+            'KiB': round(s.bytes / 1024, 1),
+        } for s in run.sections if s is not None]), hide_index=True, use_container_width=True)
+
+        st.markdown("**Recent reruns**")
+        st.dataframe(pd.DataFrame([{
+            'Started': time.strftime('%H:%M:%S', time.localtime(r.started)),
+            'ms': round(r.seconds * 1000, 1),
+            'Deltas': r.deltas,
+            'KiB': round(r.bytes / 1024, 1),
+            'Slowest section': _slowest(r),
+        } for r in reversed(profile_history())]), hide_index=True, use_container_width=True)
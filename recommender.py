@@ -0,0 +1,111 @@
+import numpy as np
+import streamlit as st
+
+from versioned_cache import VersionedRegistry
+
+# Category weights per sidebar task, tab1 priority and named recommendation.
+# Categories a catalog doesn't have are ignored, so weights can name any category.
+TASK_WEIGHTS = {
+    "Research with citations": {'Research': 1.0, 'Current Info': 0.5},
+    "Write long content": {'Writing': 1.0, 'Analysis': 0.5},
+    "Creative brainstorming": {'Creative': 1.0, 'Conversation': 0.5},
+    "Video collaboration": {'Collaboration': 1.0, 'Conversation': 0.3},
+    "Code debugging": {'Coding': 1.0, 'Analysis': 0.5},
+    "Current events": {'Current Info': 1.0, 'Research': 0.5},
+    "Data analysis": {'Analysis': 1.0, 'Coding': 0.3, 'Research': 0.2},
+}
+
+PRIORITY_WEIGHTS = {
+    "Current Information": {'Current Info': 1.0, 'Research': 0.5},
+    "Long Context Analysis": {'Analysis': 1.0, 'Writing': 0.5},
+    "Creative Output": {'Creative': 1.0, 'Writing': 0.3},
+    "Team Collaboration": {'Collaboration': 1.0, 'Conversation': 0.3},
+    "Academic Research": {'Research': 1.0, 'Analysis': 0.5},
+    "Code Quality": {'Coding': 1.0, 'Analysis': 0.3},
+}
+
+PROFILE_WEIGHTS = {
+    'quick_answers': {'Current Info': 1.0, 'Research': 0.5},
+    'long_documents': {'Analysis': 1.0, 'Writing': 1.0},
+    'creative_work': {'Creative': 1.0},
+    'video_collaboration': {'Collaboration': 1.0},
+    'academic_research': {'Research': 1.0, 'Analysis': 0.5},
+    'code_review': {'Coding': 1.0, 'Analysis': 0.5},
+    'brainstorming': {'Creative': 1.0, 'Conversation': 0.5},
+    'screen_sharing': {'Collaboration': 1.0, 'Current Info': 0.2},
+}
+
+
+def _weights_key(weights):
+    return tuple(sorted(weights.items()))
+
+
+class Recommender:
+    """Ranks tools by a weighted average of their category scores.
+
+    Each distinct weight vector costs one matrix-vector product over the score
+    matrix; the resulting per-tool fit scores are cached on the instance.
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self._filled = np.nan_to_num(matrix.values, nan=0.0)
+        self._fits = {}
+
+    def weight_vector(self, weights):
+        vector = np.zeros(len(self.matrix.categories))
+        for j, category in enumerate(self.matrix.categories):
+            vector[j] = weights.get(category, 0.0)
+        total = vector.sum()
+        return vector / total if total else vector
+
+    def fit_scores(self, weights):
+        """Weighted 0-10 fit score for every tool in the matrix."""
+        key = _weights_key(weights)
+        fits = self._fits.get(key)
+        if fits is None:
+            fits = self._filled @ self.weight_vector(weights)
+            fits.setflags(write=False)
+            self._fits[key] = fits
+        return fits
+
+    def rank(self, weights, k=3, tools=None):
+        """Top-k (tool, fit score) pairs, best first; ties keep catalog order."""
+        fits = self.fit_scores(weights)
+        names = self.matrix.tools
+        if tools is not None:
+            fits, names = fits[self.matrix.tool_rows(tools)], list(tools)
+        order = np.lexsort((np.arange(len(names)), -fits))[:k]
+        return [(names[i], float(fits[i])) for i in order]
+
+    def best(self, weights, tools=None):
+        ranking = self.rank(weights, k=1, tools=tools)
+        return ranking[0][0] if ranking else None
+
+    def recommendations(self):
+        """Named recommendation -> best tool, replacing the old static lookup."""
+        return {name: self.best(weights) for name, weights in PROFILE_WEIGHTS.items()}
+
+    def updated(self, matrix, changed_tools):
+        """Recommender for an edited matrix, recomputing only the changed tools' rows.
+
+        Falls back to an empty cache when tools or categories were added,
+        removed or reordered.
+        """
+        if matrix.tools != self.matrix.tools or matrix.categories != self.matrix.categories:
+            return Recommender(matrix)
+        updated = Recommender(matrix)
+        rows = matrix.tool_rows([t for t in changed_tools if t in matrix])
+        for key, fits in self._fits.items():
+            fits = fits.copy()
+            if rows:
+                fits[rows] = updated._filled[rows] @ updated.weight_vector(dict(key))
+            fits.setflags(write=False)
+            updated._fits[key] = fits
+        return updated
+
+
+@st.cache_resource(show_spinner=False)
+def get_recommender_registry():
+    # Per server process; an edit derives the next version's recommender with updated()
+    return VersionedRegistry(Recommender, Recommender.updated, maxsize=16)
@@ -0,0 +1,187 @@
+"""Score history: every score change as a timestamped point in a NumPy memmap.
+
+Points are fixed-size records (time, tool id, category id, score) appended to
+journal/history/points.bin. keys.json numbers the tool and category names.
+The edit journal appends a point for every score a save, undo or redo
+changes (see journal.py). A removed score or tool is a NaN point, which ends
+its line.
+
+Reading maps the file and selects points with array masks, so a year of
+history for hundreds of tools never becomes Python objects. Only the series
+being plotted do, after series() has cut each one down to at most
+MAX_POINTS points.
+
+Writers lock the points file (flock), so workers sharing the journal folder
+append whole records in turn.
+"""
+import fcntl
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+POINT = np.dtype([('ts', '<f8'), ('tool', '<u4'), ('category', '<u4'), ('score', '<f4')])
+
+# Points per plotted series after downsampling
+MAX_POINTS = 200
+
+
+def score_points(changes):
+    """[(tool, category, score or None), ...] for the scores a change list sets or removes."""
+    points = []
+    for path, before, after in changes:
+        if path[0] != 'tools' or len(path) < 2 or len(path) > 2 and path[2] != 'scores':
+            continue
+        if len(path) == 4:
+            old, new = {path[3]: before}, {path[3]: after}
+        else:
+            old = _scores(before, len(path))
+            new = _scores(after, len(path))
+        for category in dict.fromkeys([*old, *new]):
+            value = new.get(category)
+            if not isinstance(value, (int, float)):
+                value = None
+            if value != old.get(category) or value is None:
+                points.append((path[1], category, value))
+    return points
+
+
+def _scores(value, depth):
+    # A whole tool (depth 2) or its scores dict (depth 3); missing is no scores
+    if not isinstance(value, dict):
+        return {}
+    return value.get('scores', {}) if depth == 2 else value
+
+
+def catalog_points(data):
+    """Every current score of a catalog, as score_points."""
+    return [(name, category, score)
+            for name, tool in data['tools'].items() for category, score in tool['scores'].items()]
+
+
+class ScoreHistory:
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.points_path = directory / 'points.bin'
+        self.keys_path = directory / 'keys.json'
+        self._keys = {'tools': [], 'categories': []}
+        # name -> id for each kind, kept in step with _keys
+        self._index = {'tools': {}, 'categories': {}}
+        self._keys_stamp = None
+
+    def _load_keys(self):
+        try:
+            stat = self.keys_path.stat()
+        except FileNotFoundError:
+            return
+        if (stat.st_mtime_ns, stat.st_size) != self._keys_stamp:
+            self._keys = json.loads(self.keys_path.read_text(encoding='utf-8'))
+            self._index = {kind: {name: i for i, name in enumerate(names)} for kind, names in self._keys.items()}
+            self._keys_stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def _id(self, kind, name):
+        index = self._index[kind]
+        tool_id = index.get(name)
+        if tool_id is None:
+            tool_id = index[name] = len(self._keys[kind])
+            self._keys[kind].append(name)
+        return tool_id
+
+    def append(self, points, ts=None, only_if_empty=False):
+        """Append [(tool, category, score or None), ...] stamped ts (default: now)."""
+        if not points:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.points_path, 'ab') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                size = f.seek(0, os.SEEK_END)
+                if only_if_empty and size:
+                    return
+                if size % POINT.itemsize:
+                    # A torn record from a crash mid-append; drop it to stay aligned
+                    f.truncate(size - size % POINT.itemsize)
+                self._load_keys()
+                known = len(self._keys['tools']), len(self._keys['categories'])
+                records = np.empty(len(points), POINT)
+                records['ts'] = time.time() if ts is None else ts
+                records['tool'] = [self._id('tools', tool) for tool, _, _ in points]
+                records['category'] = [self._id('categories', category) for _, category, _ in points]
+                records['score'] = [np.nan if score is None else score for _, _, score in points]
+                if (len(self._keys['tools']), len(self._keys['categories'])) != known:
+                    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.directory,
+                                                     prefix=f".{self.keys_path.name}.", suffix='.tmp',
+                                                     delete=False) as tmp:
+                        tmp.write(json.dumps(self._keys))
+                    Path(tmp.name).replace(self.keys_path)
+                f.write(records.tobytes())
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def seed(self, points):
+        """Start an empty history from the given points (a no-op once it has any)."""
+        self.append(points, only_if_empty=True)
+
+    def _data(self):
+        try:
+            count = self.points_path.stat().st_size // POINT.itemsize
+        except FileNotFoundError:
+            count = 0
+        if not count:
+            return np.empty(0, POINT)
+        return np.memmap(self.points_path, POINT, 'r', shape=(count,))
+
+    def __len__(self):
+        return len(self._data())
+
+    def points(self, tools=None, categories=None, since=None):
+        """Matching points as a structured array, sorted by tool, category and time."""
+        self._load_keys()
+        data = self._data()
+        mask = np.ones(len(data), bool)
+        if tools is not None:
+            mask &= np.isin(data['tool'], self._ids('tools', tools))
+        if categories is not None:
+            mask &= np.isin(data['category'], self._ids('categories', categories))
+        if since is not None:
+            mask &= data['ts'] >= since
+        selected = np.asarray(data[mask])
+        return selected[np.lexsort((selected['ts'], selected['category'], selected['tool']))]
+
+    def _ids(self, kind, names):
+        index = self._index[kind]
+        return [index[name] for name in names if name in index]
+
+    def series(self, tools, category, since=None, until=None, max_points=MAX_POINTS):
+        """{tool: (timestamps, scores)} for one category, each cut down to max_points.
+
+        Scores are step functions, so a series is downsampled by keeping the
+        last point of each time bucket: the value in force at the bucket's end.
+        The value in force at since (if any) opens the series, and the latest
+        value is carried to until, so every line spans the whole window.
+        """
+        until = time.time() if until is None else until
+        points = self.points(tools, [category])
+        tool_names = self._keys['tools']
+        out = {}
+        # points are sorted by tool, so each tool's rows are one slice
+        tool_ids, starts = np.unique(points['tool'], return_index=True)
+        for tool_id, rows in zip(tool_ids, np.split(points, starts[1:])):
+            ts, scores = rows['ts'], rows['score'].astype(float)
+            if since is not None:
+                first = max(np.searchsorted(ts, since, side='right') - 1, 0)
+                ts, scores = ts[first:], scores[first:]
+                ts = np.maximum(ts, since)
+            if len(ts) > max_points:
+                width = (until - ts[0]) / max_points or 1.0
+                buckets = ((ts - ts[0]) // width).astype(np.int64)
+                last = np.flatnonzero(np.r_[buckets[1:] != buckets[:-1], True])
+                ts, scores = ts[last], scores[last]
+            ts, scores = np.r_[ts, until], np.r_[scores, scores[-1]]
+            out[tool_names[tool_id]] = (ts, scores)
+        return out
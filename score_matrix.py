@@ -0,0 +1,102 @@
+import numpy as np
+import streamlit as st
+
+
+class ScoreMatrix:
+    """Tools x categories score array shared by every chart and table."""
+
+    def __init__(self, tools, categories, values):
+        self.tools = list(tools)
+        self.categories = list(categories)
+        self.values = values
+        self._tool_index = {name: i for i, name in enumerate(self.tools)}
+        self._category_index = {name: i for i, name in enumerate(self.categories)}
+
+    def __contains__(self, tool):
+        return tool in self._tool_index
+
+    def tool_rows(self, tools):
+        if tools is None:
+            return slice(None)
+        return [self._tool_index[t] for t in tools]
+
+    def _cols(self, categories):
+        if categories is None:
+            return slice(None)
+        return [self._category_index.get(c, -1) for c in categories]
+
+    def scores(self, tools=None, categories=None, fill=np.nan):
+        """Return the score block for the given tools/categories (missing -> fill)."""
+        block = self.values[self.tool_rows(tools)]
+        if categories is not None:
+            cols = self._cols(categories)
+            out = np.full((block.shape[0], len(cols)), np.nan)
+            known = [i for i, c in enumerate(cols) if c >= 0]
+            if known:
+                out[:, known] = block[:, [cols[i] for i in known]]
+            block = out
+        return np.where(np.isnan(block), fill, block)
+
+    def frame(self, tools=None, categories=None, fill=np.nan):
+        # pandas is imported on first use to keep it off the cold-start path
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.scores(tools, categories, fill),
+            index=self.tools if tools is None else list(tools),
+            columns=self.categories if categories is None else list(categories),
+        )
+
+    def overall(self, tools=None):
+        """Average score per tool across the categories it is rated on."""
+        block = self.values[self.tool_rows(tools)]
+        if block.size == 0:
+            return np.zeros(block.shape[0])
+        counts = (~np.isnan(block)).sum(axis=1)
+        totals = np.nansum(block, axis=1)
+        return np.divide(totals, counts, out=np.zeros(len(totals)), where=counts > 0)
+
+    def leaders(self, categories, tools=None):
+        """(category, winning tool, score) for each category among the given tools.
+
+        Categories none of the tools is rated on are left out.
+        """
+        names = self.tools if tools is None else list(tools)
+        if not names:
+            return []
+        block = self.scores(names, categories, fill=-np.inf)
+        winners = block.argmax(axis=0)
+        return [
+            (category, names[w], block[w, j])
+            for j, (category, w) in enumerate(zip(categories, winners))
+            if np.isfinite(block[w, j])
+        ]
+
+
+def build_score_matrix(tools_data):
+    # An unedited session catalog (base_catalog.ToolsView) already has one
+    shared = getattr(tools_data, 'base_matrix', None)
+    if shared is not None:
+        return shared
+    tools = list(tools_data.keys())
+    categories = []
+    seen = set()
+    for tool in tools_data.values():
+        for category in tool['scores']:
+            if category not in seen:
+                seen.add(category)
+                categories.append(category)
+
+    col_index = {c: j for j, c in enumerate(categories)}
+    values = np.full((len(tools), len(categories)), np.nan)
+    for i, tool in enumerate(tools_data.values()):
+        for category, score in tool['scores'].items():
+            values[i, col_index[category]] = score
+    values.setflags(write=False)
+    return ScoreMatrix(tools, categories, values)
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_score_matrix(version, _tools_data):
+    """Cached ScoreMatrix for a data version; the tools dict itself is not hashed."""
+    return build_score_matrix(_tools_data)
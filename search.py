@@ -0,0 +1,198 @@
+import bisect
+import re
+
+import numpy as np
+import streamlit as st
+
+from versioned_cache import VersionedRegistry
+
+# Searchable tool fields and how much a hit in each counts towards the rank
+FIELD_WEIGHTS = {
+    'nuances': 3.0,
+    'strengths': 2.0,
+    'best_for': 1.5,
+    'weaknesses': 1.0,
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Prefix hits rank below exact token hits
+PREFIX_FACTOR = 0.6
+
+# Edits touching more tools than this rebuild the index rather than patch it
+REBUILD_THRESHOLD = 64
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def _field_texts(tool, field):
+    value = tool.get(field) or []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _tool_weights(tool):
+    """token -> summed field weight for one tool."""
+    weights = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for text in _field_texts(tool, field):
+            for token in set(tokenize(text)):
+                weights[token] = weights.get(token, 0.0) + weight
+    return weights
+
+
+class SearchIndex:
+    """Inverted index over the free-text fields of every tool.
+
+    Postings map token -> (tool ids, weights) arrays; a sorted vocabulary
+    answers prefix queries with two bisects, and scoring accumulates into one
+    dense per-tool vector. Edits derive a new index that shares every posting
+    the edit didn't touch.
+    """
+
+    def __init__(self):
+        self._names = []
+        self._ids = {}
+        self._postings = {}
+        self._vocabulary = []
+        self._tool_tokens = {}
+
+    @classmethod
+    def build(cls, tools_data):
+        index = cls()
+        grouped = {}
+        for name, tool in tools_data.items():
+            tool_id = index._new_id(name)
+            weights = _tool_weights(tool)
+            index._tool_tokens[name] = tuple(weights)
+            for token, weight in weights.items():
+                ids, values = grouped.setdefault(token, ([], []))
+                ids.append(tool_id)
+                values.append(weight)
+        index._postings = {
+            token: (np.array(ids, dtype=np.int32), np.array(values, dtype=np.float64))
+            for token, (ids, values) in grouped.items()
+        }
+        index._vocabulary = sorted(index._postings)
+        return index
+
+    def _new_id(self, name):
+        self._ids[name] = len(self._names)
+        self._names.append(name)
+        return self._ids[name]
+
+    def _remove(self, name):
+        """Drop a tool's postings; returns its freed id (its slot stays a hole) or None."""
+        tool_id = self._ids.pop(name, None)
+        if tool_id is None:
+            return None
+        self._names[tool_id] = None
+        for token in self._tool_tokens.pop(name):
+            ids, values = self._postings[token]
+            keep = ids != tool_id
+            if keep.any():
+                self._postings[token] = (ids[keep], values[keep])
+            else:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+        return tool_id
+
+    def _add(self, name, tool, tool_id=None):
+        if tool_id is None:
+            tool_id = self._new_id(name)
+        else:
+            self._ids[name] = tool_id
+            self._names[tool_id] = name
+        weights = _tool_weights(tool)
+        self._tool_tokens[name] = tuple(weights)
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                bisect.insort(self._vocabulary, token)
+                ids, values = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+            else:
+                ids, values = posting
+            self._postings[token] = (np.append(ids, np.int32(tool_id)), np.append(values, np.float64(weight)))
+
+    def updated(self, tools_data, changed_tools):
+        """New index with changed_tools re-indexed from tools_data (absent tools are dropped).
+
+        Re-indexed tools keep their ids, so ties keep their order; added tools
+        get fresh ids at the end. Removed tools leave a hole, and once holes
+        make up a quarter of the ids the index is rebuilt, as it is for bulk
+        changes (imports).
+        """
+        holes = len(self._names) - len(self._ids)
+        if len(changed_tools) > max(REBUILD_THRESHOLD, len(self._ids) // 8) or holes > len(self._names) // 4:
+            return SearchIndex.build(tools_data)
+        index = SearchIndex()
+        index._names = list(self._names)
+        index._ids = dict(self._ids)
+        index._postings = dict(self._postings)
+        index._vocabulary = list(self._vocabulary)
+        index._tool_tokens = dict(self._tool_tokens)
+        for name in changed_tools:
+            tool_id = index._remove(name)
+            if name in tools_data:
+                index._add(name, tools_data[name], tool_id)
+        return index
+
+    def _term_scores(self, term, prefix):
+        """Dense per-tool weight for one query term (exact token, plus prefix completions)."""
+        scores = np.zeros(len(self._names), dtype=np.float64)
+        if prefix:
+            start = bisect.bisect_left(self._vocabulary, term)
+            end = bisect.bisect_left(self._vocabulary, term + '\uffff')
+            for token in self._vocabulary[start:end]:
+                if token != term:
+                    ids, values = self._postings[token]
+                    scores[ids] = np.maximum(scores[ids], values * PREFIX_FACTOR)
+        posting = self._postings.get(term)
+        if posting is not None:
+            ids, values = posting
+            scores[ids] = np.maximum(scores[ids], values)
+        return scores
+
+    def search(self, query, limit=10, prefix=True):
+        """Tools matching every query term, best first, as (tool, score) pairs.
+
+        Ties keep index order, which is catalog order for an unedited index.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        total = matched = None
+        for term in terms:
+            scores = self._term_scores(term, prefix)
+            hit = scores > 0
+            total = scores if total is None else total + scores
+            matched = hit if matched is None else matched & hit
+            if not matched.any():
+                return []
+        candidates = np.flatnonzero(matched)
+        order = candidates[np.lexsort((candidates, -total[candidates]))][:limit]
+        return [(self._names[i], float(total[i])) for i in order]
+
+    def __len__(self):
+        return len(self._ids)
+
+
+def matching_snippets(tool, query, limit=3):
+    """(field, text) pairs of a tool that contain a query term or a completion of one."""
+    terms = tokenize(query)
+    snippets = []
+    for field in FIELD_WEIGHTS:
+        for text in _field_texts(tool, field):
+            tokens = tokenize(text)
+            if any(token.startswith(term) for term in terms for token in tokens):
+                snippets.append((field, text))
+                if len(snippets) == limit:
+                    return snippets
+    return snippets
+
+
+@st.cache_resource(show_spinner=False)
+def get_search_registry():
+    # Per server process; an edit re-indexes only the changed tools with updated()
+    return VersionedRegistry(SearchIndex.build, SearchIndex.updated, maxsize=8)
@@ -0,0 +1,54 @@
+"""Fast cold-start entry point: pre-warms shared caches at server boot.
+
+    streamlit run serve.py        # instead of: streamlit run app.py
+
+The lifespan hook runs warmup.prewarm() once before the server accepts
+connections, so no visitor pays for the heavy imports or the first builds.
+Content-hashed static assets (see assets.py) are served with a year-long
+immutable Cache-Control, so browsers never revalidate them.
+app.py itself is unchanged and still runs standalone.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.middleware import Middleware
+
+from assets import HASHED_ASSET_PATH
+from warmup import prewarm
+
+IMMUTABLE = b'public, max-age=31536000, immutable'
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    timings = await asyncio.to_thread(prewarm)
+    logger.info("Pre-warmed caches in %.0f ms: %s", sum(timings.values()) * 1000,
+                ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+    yield
+
+
+class ImmutableAssets:
+    """ASGI middleware: a content-hashed asset never changes, so browsers may keep it for a year."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not HASHED_ASSET_PATH.search(scope['path']):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_immutable(message):
+            if message['type'] == 'http.response.start' and message['status'] == 200:
+                headers = [(k, v) for k, v in message['headers'] if k.lower() != b'cache-control']
+                message = {**message, 'headers': [*headers, (b'cache-control', IMMUTABLE)]}
+            await send(message)
+
+        await self.app(scope, receive, send_immutable)
+
+
+app = st.App("app.py", lifespan=lifespan, middleware=[Middleware(ImmutableAssets)])
@@ -0,0 +1,216 @@
+"""Static HTML snapshot of the dashboard for read-only viewers.
+
+    python snapshot.py                      # writes static/snapshot/
+    python snapshot.py --out /srv/www/ai-tools --force
+
+Renders the journal's current catalog (what a new session would see) to a
+self-contained bundle: index.html with the radar, heatmap, bar charts,
+comparison table and feature cards, an offline copy of Plotly JS, and the
+logos and CSS from the asset store. Any static file server can host it, and
+so can Streamlit's static route (app/static/snapshot/index.html), which keeps
+read traffic off the script runner and its websockets.
+
+The bundle records its data version in snapshot.json; a run against an
+unchanged catalog returns without writing anything, so the command is cheap
+to run after every edit or from cron.
+"""
+import argparse
+import html
+import json
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+from assets import APP_DIR, BRAND_COLORS, STATIC_DIR, AssetStore, ToolColors, build_css, load_manifest
+from cards import feature_card, leader_card
+from catalog import data_version
+from figures import BUILDERS
+from journal import read_catalog
+from score_matrix import build_score_matrix
+
+SNAPSHOT_DIR = APP_DIR / 'static' / 'snapshot'
+MANIFEST_NAME = 'snapshot.json'
+ASSET_DIR_NAME = 'assets'
+
+# Chart sections in page order: (figure kind, heading)
+CHART_SECTIONS = [
+    ('radar', "🎯 Capability Overview"),
+    ('heatmap', "📊 Detailed Capability Breakdown"),
+    ('strengths', "💪 Comparative Strengths"),
+    ('mdaa', "📈 MDAA Team Performance Metrics"),
+]
+LEADER_CATEGORIES = ['Writing', 'Research', 'Creative', 'Analysis']
+
+# Page chrome only; cards and tags are styled by assets/app.css as in the app
+PAGE_CSS = """\
+body { margin: 0; background: #0e1117; color: #fafafa; font-family: "Source Sans Pro", sans-serif; }
+main { max-width: 1200px; margin: 0 auto; padding: 24px; }
+a { color: #74AA9C; }
+.grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(340px, 1fr)); gap: 0 24px; }
+.leaders { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 12px; }
+table.comparison { width: 100%; border-collapse: collapse; font-size: 14px; }
+table.comparison th, table.comparison td { padding: 8px 10px; border-bottom: 1px solid rgba(255,255,255,0.1); text-align: left; vertical-align: top; }
+table.comparison th { color: #aaa; font-weight: 600; }
+.score-bar { background: rgba(255,255,255,0.1); border-radius: 4px; height: 8px; width: 100px; margin-top: 4px; }
+.score-bar div { background: #74AA9C; border-radius: 4px; height: 8px; }
+footer { text-align: center; color: #888; padding: 20px; margin-top: 30px; font-size: 13px; }
+"""
+
+PAGE = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>AI Tools Comparison - MDAA Team</title>
+<script src="{plotly_js}"></script>
+{css}
+<style>
+{page_css}</style>
+</head>
+<body>
+<main>
+<h1>🤖 AI Tools Comparison Dashboard</h1>
+<p>Read-only snapshot of {tool_count} tools. Open the live dashboard to edit the data or get tailored recommendations.</p>
+{body}
+<footer>
+    AI Tools Comparison Dashboard - MDAA Team (INTERNAL)<br>
+    Data version {version} · generated {generated}
+</footer>
+</main>
+</body>
+</html>
+"""
+
+
+def read_manifest(out_dir):
+    path = Path(out_dir) / MANIFEST_NAME
+    if path.exists():
+        return json.loads(path.read_text())
+    return None
+
+
+def _comparison_table(data, matrix, tools):
+    rows = []
+    for name, overall in zip(tools, matrix.overall(tools)):
+        tool = data['tools'][name]
+        cells = [
+            name,
+            tool['best_for'],
+            tool['strengths'][0] if tool['strengths'] else '',
+            tool['nuances'][0] if tool['nuances'] else '',
+            '✅' if tool['price']['free'] else '❌',
+            f"${tool['price']['paid']}/mo",
+        ]
+        rows.append(
+            '<tr>' + ''.join(f'<td>{html.escape(str(c))}</td>' for c in cells)
+            + f'<td>{overall:.1f}/10<div class="score-bar"><div style="width: {overall * 10:.0f}%;"></div></div></td></tr>'
+        )
+    headers = ['Tool', 'Best For', 'Top Strength', 'Unique Feature', 'Free', 'Pro Price', 'Overall Score']
+    return (
+        '<table class="comparison"><thead><tr>' + ''.join(f'<th>{h}</th>' for h in headers)
+        + '</tr></thead><tbody>' + ''.join(rows) + '</tbody></table>'
+    )
+
+
+def render_page(data, version, matrix, store, plotly_js):
+    tools = list(data['tools'])
+    colors = ToolColors(BRAND_COLORS)
+    logos = store.logos
+    parts = []
+
+    for kind, heading in CHART_SECTIONS:
+        fig = BUILDERS[kind](matrix, tools, colors)
+        parts.append(f'<h2>{heading}</h2>')
+        parts.append(fig.to_html(full_html=False, include_plotlyjs=False, config={'responsive': True}))
+        if kind == 'heatmap':
+            parts.append('<h3>🏆 Category Leaders</h3><div class="leaders">' + ''.join(
+                leader_card(version, category, winner, score, colors[winner], logos[winner])
+                for category, winner, score in matrix.leaders(LEADER_CATEGORIES, tools)
+            ) + '</div>')
+
+    parts.append('<h2>📋 Comprehensive Comparison Table</h2>')
+    parts.append(_comparison_table(data, matrix, tools))
+
+    parts.append('<h2>🔍 Unique Features</h2><div class="grid">')
+    parts.extend(feature_card(version, name, data['tools'][name], colors[name], logos[name]) for name in tools)
+    parts.append('</div>')
+
+    return PAGE.format(
+        plotly_js=html.escape(plotly_js),
+        css=store.css_tag(),
+        page_css=PAGE_CSS,
+        tool_count=len(tools),
+        body='\n'.join(parts),
+        version=version,
+        generated=datetime.now().strftime("%B %d, %Y at %I:%M %p"),
+    )
+
+
+def _asset_files(store):
+    files = {url.rsplit('/', 1)[1] for url in store.logos.values()}
+    if store.manifest.get('css'):
+        files.add(store.manifest['css'])
+    return files
+
+
+def build_snapshot(out_dir=SNAPSHOT_DIR, data=None, force=False):
+    """Write the bundle for the current data version; returns (manifest, built)."""
+    import plotly.offline
+
+    out_dir = Path(out_dir)
+    data = read_catalog() if data is None else data
+    version = data_version(data)
+    existing = read_manifest(out_dir)
+    if not force and existing and existing.get('version') == version:
+        return existing, False
+
+    started = time.perf_counter()
+    matrix = build_score_matrix(data['tools'])
+    # Logos already ingested by the app; tools without one get the shared placeholder
+    store = AssetStore(build_css(load_manifest()), True, url_prefix=ASSET_DIR_NAME)
+    plotly_js = f"plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+    page = render_page(data, version, matrix, store, plotly_js)
+
+    # Build next to the target and swap it in, so a server never sees half a bundle
+    tmp = out_dir.with_name(f".{out_dir.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    (tmp / ASSET_DIR_NAME).mkdir(parents=True)
+    (tmp / 'index.html').write_text(page, encoding='utf-8')
+    (tmp / plotly_js).write_text(plotly.offline.get_plotlyjs(), encoding='utf-8')
+    for filename in _asset_files(store):
+        shutil.copy2(STATIC_DIR / filename, tmp / ASSET_DIR_NAME / filename)
+    manifest = {
+        'version': version,
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'tools': len(data['tools']),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+    (tmp / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+    old = out_dir.with_name(f".{out_dir.name}.old")
+    shutil.rmtree(old, ignore_errors=True)
+    if out_dir.exists():
+        out_dir.rename(old)
+    tmp.rename(out_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    return manifest, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the current catalog to a static HTML bundle.")
+    parser.add_argument('--out', type=Path, default=SNAPSHOT_DIR, help="bundle directory (default: static/snapshot)")
+    parser.add_argument('--force', action='store_true', help="rebuild even if the data version is unchanged")
+    args = parser.parse_args()
+
+    manifest, built = build_snapshot(args.out, force=args.force)
+    if built:
+        print(f"Wrote {args.out / 'index.html'} for data version {manifest['version']} "
+              f"({manifest['tools']} tools, {manifest['seconds'] * 1000:.0f} ms)")
+    else:
+        print(f"{args.out} is already at data version {manifest['version']}; nothing to do")
+
+
+if __name__ == '__main__':
+    main()
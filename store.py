@@ -0,0 +1,411 @@
+"""SQLite catalog store (WAL mode), the persistent home of the catalog.
+
+Tools, their scores and list fields, use cases and the materialized
+recommendation picks each have a table. Lookups by tool name and by category
+are indexed. Every journaled edit (see journal.py) is written together with
+the row-level updates it implies in one transaction. Saving one changed
+score, for example, updates one score row and inserts one row in edits. The
+whole catalog is never rewritten.
+
+The recommendations table is for SQL readers; the app ranks from its own
+score matrix. After a save that changed scores, a background thread
+recomputes it outside the save's transaction and records the edit seq it
+reflects as recommendations_seq in meta.
+
+WAL mode lets readers such as api.py, snapshot.py and other server
+processes read while a session saves. Each thread gets its own connection.
+
+    python store.py            # print row counts and the current edit seq
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+SCHEMA = """\
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tools (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    logo TEXT,
+    best_for TEXT NOT NULL,
+    free INTEGER NOT NULL,
+    paid NUMERIC NOT NULL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS scores (
+    tool_id INTEGER NOT NULL REFERENCES tools(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    score NUMERIC NOT NULL,
+    PRIMARY KEY (tool_id, category)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scores_by_category ON scores (category, score);
+CREATE TABLE IF NOT EXISTS tool_lists (
+    tool_id INTEGER NOT NULL REFERENCES tools(id) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (tool_id, field, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS use_cases (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS use_case_tools (
+    use_case TEXT NOT NULL REFERENCES use_cases(name) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    PRIMARY KEY (use_case, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS use_case_tools_by_tool ON use_case_tools (tool);
+CREATE TABLE IF NOT EXISTS recommendations (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    fit REAL NOT NULL,
+    PRIMARY KEY (kind, name, rank)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS edits (
+    seq INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    op TEXT NOT NULL,
+    changes TEXT NOT NULL
+);
+"""
+
+LIST_FIELDS = ('strengths', 'weaknesses', 'nuances')
+TOOL_COLUMNS = ('logo', 'best_for')
+
+# Picks kept per named recommendation in the recommendations table
+TOP_PICKS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogStore:
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._refresh_wanted = threading.Event()
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            # Autocommit; transactions are opened explicitly with BEGIN
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+        return db
+
+    def _transaction(self, mode='IMMEDIATE'):
+        return _Transaction(self._db(), mode)
+
+    # Reads
+
+    def seq(self):
+        """Sequence number of the latest applied edit (0 before any edit)."""
+        row = self._db().execute("SELECT value FROM meta WHERE key = 'seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _meta_int(self, key, default=0):
+        row = self._db().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else default
+
+    def is_empty(self):
+        return self._db().execute("SELECT 1 FROM meta WHERE key = 'seq'").fetchone() is None
+
+    def catalog(self):
+        """(seq, the whole catalog as plain dicts), read in one consistent snapshot."""
+        with self._transaction('DEFERRED') as db:
+            seq = self.seq()
+            tools = {}
+            names = {}
+            for tool_id, name, logo, best_for, free, paid, extra in db.execute(
+                    "SELECT id, name, logo, best_for, free, paid, extra FROM tools ORDER BY position"):
+                names[tool_id] = name
+                tools[name] = {'logo': logo, 'strengths': [], 'weaknesses': [], 'nuances': [],
+                               'best_for': best_for, 'price': {'free': bool(free), 'paid': paid}, 'scores': {},
+                               **(json.loads(extra) if extra else {})}
+            for tool_id, field, value in db.execute(
+                    "SELECT tool_id, field, value FROM tool_lists ORDER BY tool_id, field, position"):
+                tools[names[tool_id]][field].append(value)
+            for tool_id, category, score in db.execute(
+                    "SELECT tool_id, category, score FROM scores ORDER BY tool_id, position"):
+                tools[names[tool_id]]['scores'][category] = score
+            use_cases = {name: [] for (name,) in db.execute("SELECT name FROM use_cases ORDER BY position")}
+            for use_case, tool in db.execute("SELECT use_case, tool FROM use_case_tools ORDER BY use_case, rank"):
+                use_cases[use_case].append(tool)
+        return seq, {'tools': tools, 'use_cases': use_cases}
+
+    # Edits and the journal
+
+    def edits_after(self, seq):
+        """[(seq, op, encoded changes), ...] journaled after seq, oldest first."""
+        return [(s, op, json.loads(changes)) for s, op, changes in self._db().execute(
+            "SELECT seq, op, changes FROM edits WHERE seq > ? ORDER BY seq", (seq,))]
+
+    def checkpoint(self):
+        row = self._db().execute("SELECT value FROM meta WHERE key = 'checkpoint'").fetchone()
+        return json.loads(row[0]) if row else {'seq': 0, 'undo': [], 'redo': []}
+
+    def seed(self, data):
+        """Fill an empty store with data; a no-op if another process got there first."""
+        with self._transaction() as db:
+            if db.execute("SELECT 1 FROM meta WHERE key = 'seq'").fetchone():
+                return
+            for name, tool in data['tools'].items():
+                self._insert_tool(db, name, tool)
+            for name, members in data['use_cases'].items():
+                self._put_use_case(db, name, members)
+            db.execute("INSERT INTO meta VALUES ('seq', '0')")
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('scores_seq', '0')")
+        self._schedule_refresh()
+
+    def append(self, op, changes, expected_seq=None):
+        """Journal one edit and apply it to the catalog rows in a single transaction; returns its seq.
+
+        changes is the encoded change list: {'path', 'before'?, 'after'?} dicts,
+        where a missing 'after' removes the value at path. With expected_seq,
+        raises StaleSeq instead if another writer has appended since then.
+        """
+        with self._transaction() as db:
+            seq = self.seq()
+            if expected_seq is not None and seq != expected_seq:
+                raise StaleSeq(expected_seq, seq)
+            seq += 1
+            db.execute("INSERT INTO edits VALUES (?, ?, ?, ?)",
+                       (seq, time.time(), op, json.dumps(changes, separators=(',', ':'))))
+            scores_changed = False
+            for change in changes:
+                scores_changed |= self._apply(db, change['path'], change.get('after', _REMOVED))
+            if scores_changed:
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('scores_seq', ?)", (str(seq),))
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('seq', ?)", (str(seq),))
+        if scores_changed:
+            self._schedule_refresh()
+        return seq
+
+    def compact(self, seq, undo, redo):
+        """Checkpoint the undo/redo stacks at seq and drop the edit rows up to it."""
+        with self._transaction() as db:
+            if self.checkpoint()['seq'] > seq:
+                # Another writer already checkpointed a later state
+                return
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('checkpoint', ?)",
+                       (json.dumps({'seq': seq, 'undo': undo, 'redo': redo}, separators=(',', ':')),))
+            db.execute("DELETE FROM edits WHERE seq <= ?", (seq,))
+
+    # Row-level writes (inside a transaction)
+
+    def _tool_id(self, db, name):
+        row = db.execute("SELECT id FROM tools WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _insert_tool(self, db, name, tool, position=None):
+        if position is None:
+            position = db.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tools").fetchone()[0]
+        extra = {k: v for k, v in tool.items() if k not in (*TOOL_COLUMNS, *LIST_FIELDS, 'price', 'scores')}
+        tool_id = db.execute(
+            "INSERT INTO tools (name, position, logo, best_for, free, paid, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, position, tool.get('logo'), tool['best_for'], tool['price']['free'], tool['price']['paid'],
+             json.dumps(extra) if extra else None)).lastrowid
+        for field in LIST_FIELDS:
+            self._put_list(db, tool_id, field, tool[field])
+        self._put_scores(db, tool_id, tool['scores'])
+
+    def _put_list(self, db, tool_id, field, values):
+        db.execute("DELETE FROM tool_lists WHERE tool_id = ? AND field = ?", (tool_id, field))
+        db.executemany("INSERT INTO tool_lists VALUES (?, ?, ?, ?)",
+                       [(tool_id, field, i, v) for i, v in enumerate(values)])
+
+    def _put_scores(self, db, tool_id, scores):
+        db.execute("DELETE FROM scores WHERE tool_id = ?", (tool_id,))
+        db.executemany("INSERT INTO scores VALUES (?, ?, ?, ?)",
+                       [(tool_id, c, i, s) for i, (c, s) in enumerate(scores.items())])
+
+    def _put_use_case(self, db, name, members):
+        position = db.execute("SELECT position FROM use_cases WHERE name = ?", (name,)).fetchone()
+        if position is None:
+            position = db.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM use_cases").fetchone()
+            db.execute("INSERT INTO use_cases VALUES (?, ?)", (name, position[0]))
+        db.execute("DELETE FROM use_case_tools WHERE use_case = ?", (name,))
+        db.executemany("INSERT INTO use_case_tools VALUES (?, ?, ?)",
+                       [(name, rank, tool) for rank, tool in enumerate(members)])
+
+    def _apply(self, db, path, value):
+        """Write one change; returns True if it touched scores."""
+        if path[0] == 'use_cases' and len(path) == 2:
+            if value is _REMOVED:
+                db.execute("DELETE FROM use_cases WHERE name = ?", (path[1],))
+            else:
+                self._put_use_case(db, path[1], value)
+            return False
+        if path[0] != 'tools' or len(path) < 2:
+            raise ValueError(f"cannot store a change at {path}")
+
+        name, rest = path[1], path[2:]
+        tool_id = self._tool_id(db, name)
+        if not rest:
+            # The whole tool was added, removed or replaced; a replacement keeps its place
+            position = None
+            if tool_id is not None:
+                position = db.execute("SELECT position FROM tools WHERE id = ?", (tool_id,)).fetchone()[0]
+                db.execute("DELETE FROM tools WHERE id = ?", (tool_id,))
+            if value is not _REMOVED:
+                self._insert_tool(db, name, value, position)
+            return True
+        if tool_id is None:
+            raise ValueError(f"no tool {name!r} to change at {path}")
+
+        field = rest[0]
+        if field == 'scores':
+            if len(rest) == 1:
+                self._put_scores(db, tool_id, {} if value is _REMOVED else value)
+            elif value is _REMOVED:
+                db.execute("DELETE FROM scores WHERE tool_id = ? AND category = ?", (tool_id, rest[1]))
+            else:
+                updated = db.execute("UPDATE scores SET score = ? WHERE tool_id = ? AND category = ?",
+                                     (value, tool_id, rest[1])).rowcount
+                if not updated:
+                    db.execute("INSERT INTO scores SELECT ?, ?, COALESCE(MAX(position), -1) + 1, ? "
+                               "FROM scores WHERE tool_id = ?", (tool_id, rest[1], value, tool_id))
+            return True
+        if field in LIST_FIELDS and len(rest) == 1:
+            self._put_list(db, tool_id, field, [] if value is _REMOVED else value)
+        elif field in TOOL_COLUMNS and len(rest) == 1:
+            db.execute(f"UPDATE tools SET {field} = ? WHERE id = ?", (None if value is _REMOVED else value, tool_id))
+        elif field == 'price':
+            price = value if len(rest) == 1 else {rest[1]: value}
+            for key in ('free', 'paid'):
+                if key in price:
+                    db.execute(f"UPDATE tools SET {key} = ? WHERE id = ?", (price[key], tool_id))
+        else:
+            # Fields outside the schema live in the tool's extra JSON
+            row = db.execute("SELECT extra FROM tools WHERE id = ?", (tool_id,)).fetchone()
+            extra = json.loads(row[0]) if row[0] else {}
+            target = extra
+            for key in rest[:-1]:
+                target = target.setdefault(key, {})
+            if value is _REMOVED:
+                target.pop(rest[-1], None)
+            else:
+                target[rest[-1]] = value
+            db.execute("UPDATE tools SET extra = ? WHERE id = ?", (json.dumps(extra) if extra else None, tool_id))
+        return False
+
+    # Materialized recommendations
+
+    def refresh_recommendations(self):
+        """Recompute the recommendations table from the current scores, if they changed since."""
+        from recommender import PRIORITY_WEIGHTS, PROFILE_WEIGHTS, TASK_WEIGHTS, Recommender
+        from score_matrix import build_score_matrix
+
+        groups = {'profile': PROFILE_WEIGHTS, 'task': TASK_WEIGHTS, 'priority': PRIORITY_WEIGHTS}
+        # Only weighted categories affect a ranking, so only their rows are read (by the category index)
+        categories = sorted({category for named in groups.values()
+                             for weights in named.values() for category in weights})
+        # Scores are read and ranked outside any write lock; saves go on meanwhile
+        with self._transaction('DEFERRED') as db:
+            scores_seq = self._meta_int('scores_seq')
+            if self._meta_int('recommendations_seq', None) == scores_seq:
+                return
+            tools = {name: {'scores': {}} for (name,) in db.execute("SELECT name FROM tools ORDER BY position")}
+            for name, category, score in db.execute(
+                    "SELECT t.name, s.category, s.score FROM scores s JOIN tools t ON t.id = s.tool_id "
+                    f"WHERE s.category IN ({', '.join('?' * len(categories))})", categories):
+                tools[name]['scores'][category] = score
+        recommender = Recommender(build_score_matrix(tools))
+        rows = [
+            (kind, name, rank, tool, fit)
+            for kind, named in groups.items()
+            for name, weights in named.items()
+            for rank, (tool, fit) in enumerate(recommender.rank(weights, k=TOP_PICKS))
+        ]
+        with self._transaction() as db:
+            if self._meta_int('scores_seq') != scores_seq:
+                # Scores changed again since the read; that save scheduled its own refresh
+                return
+            db.execute("DELETE FROM recommendations")
+            db.executemany("INSERT INTO recommendations VALUES (?, ?, ?, ?, ?)", rows)
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('recommendations_seq', ?)", (str(scores_seq),))
+
+    def _schedule_refresh(self):
+        # Wake the refresher, starting it on the first save that changes scores;
+        # a burst of saves costs one refresh
+        self._refresh_wanted.set()
+        with self._refresher_lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name='store-recommendations',
+                                                   daemon=True)
+                self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            self._refresh_wanted.wait()
+            self._refresh_wanted.clear()
+            try:
+                self.refresh_recommendations()
+            except Exception:
+                logger.exception("Could not refresh the recommendations table")
+
+
+class StaleSeq(Exception):
+    """The store moved past the seq a writer expected (another worker saved first)."""
+
+    def __init__(self, expected, actual):
+        super().__init__(f"expected edit seq {expected}, store is at {actual}")
+        self.expected = expected
+        self.actual = actual
+
+
+class _Removed:
+    pass
+
+
+# A change without an 'after' value removes the value at its path
+_REMOVED = _Removed()
+
+
+class _Transaction:
+
+    def __init__(self, db, mode):
+        self.db = db
+        self.mode = mode
+
+    def __enter__(self):
+        self.db.execute(f"BEGIN {self.mode}")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+
+def main():
+    from journal import open_store
+
+    store = open_store()
+    # Brings the recommendations table up to date if a process exited before its refresh
+    store.refresh_recommendations()
+    print(f"{store.path} (edit seq {store.seq()}, recommendations as of seq {store._meta_int('recommendations_seq')})")
+    for table in ('tools', 'scores', 'tool_lists', 'use_cases', 'use_case_tools', 'recommendations', 'edits'):
+        count = store._db().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        print(f"  {table:<16} {count:>8} rows")
+
+
+if __name__ == '__main__':
+    main()
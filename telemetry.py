@@ -0,0 +1,128 @@
+"""In-process usage telemetry.
+
+track() only appends to a bounded deque, so the script thread never waits on
+I/O. A background thread drains the buffer every few seconds and writes the
+batch to SQLite in one transaction. Events older than RETENTION_SECONDS are
+deleted about once an hour. Every worker writes to the same events.db, so
+the admin view counts from it and sees all workers, up to FLUSH_INTERVAL
+behind.
+"""
+import atexit
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+
+import streamlit as st
+
+from assets import APP_DIR
+
+TELEMETRY_DIR = APP_DIR / 'telemetry'
+
+FLUSH_INTERVAL = 5.0
+
+# Events beyond this are dropped (oldest first) if the flusher falls behind
+MAX_BUFFERED = 10000
+
+WINDOWS = {
+    "Last hour": 3600,
+    "Last 24 hours": 24 * 3600,
+}
+
+# Raw events are kept this long (longer than the widest window), pruned every PRUNE_INTERVAL
+RETENTION_SECONDS = 30 * 24 * 3600
+PRUNE_INTERVAL = 3600
+
+SCHEMA = """\
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS events (ts REAL NOT NULL, kind TEXT NOT NULL, value TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS events_by_kind ON events (kind, ts);
+CREATE INDEX IF NOT EXISTS events_by_ts ON events (ts);
+"""
+
+
+class Telemetry:
+    def __init__(self, directory, flush_interval=FLUSH_INTERVAL):
+        self.db_path = directory / 'events.db'
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._pruned_at = 0.0
+        self._buffer = deque(maxlen=MAX_BUFFERED)
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='telemetry-flush', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def track(self, kind, value):
+        """Record one event; never blocks on I/O."""
+        if len(self._buffer) == MAX_BUFFERED:
+            self.dropped += 1
+        self._buffer.append((time.time(), kind, str(value)))
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._buffer.popleft())
+            except IndexError:
+                return batch
+
+    def flush(self):
+        with self._flush_lock:
+            batch = self._drain()
+            if not batch:
+                return 0
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            now = time.time()
+            db = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                db.executescript(SCHEMA)
+                with db:
+                    db.executemany("INSERT INTO events (ts, kind, value) VALUES (?, ?, ?)", batch)
+                    if now - self._pruned_at >= PRUNE_INTERVAL:
+                        db.execute("DELETE FROM events WHERE ts < ?", (now - RETENTION_SECONDS,))
+                        self._pruned_at = now
+            finally:
+                db.close()
+            return len(batch)
+
+    def counts(self, kind, window):
+        """Counter of values for one event kind over the last window seconds, from every worker."""
+        if not self.db_path.exists():
+            return Counter()
+        db = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            rows = db.execute("SELECT value, COUNT(*) FROM events WHERE kind = ? AND ts >= ? GROUP BY value",
+                              (kind, time.time() - window)).fetchall()
+        except sqlite3.OperationalError:
+            # No events table until the first flush
+            return Counter()
+        finally:
+            db.close()
+        return Counter(dict(rows))
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except (sqlite3.Error, OSError):
+                # Keep collecting counters even if the sink is unavailable
+                pass
+
+    def close(self):
+        self._stop.set()
+        try:
+            self.flush()
+        except (sqlite3.Error, OSError):
+            pass
+
+
+@st.cache_resource(show_spinner=False)
+def get_telemetry():
+    # One buffer and flush thread per server process, shared by all sessions
+    return Telemetry(TELEMETRY_DIR)
+
+
+def track(kind, value):
+    get_telemetry().track(kind, value)
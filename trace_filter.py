@@ -0,0 +1,170 @@
+"""Client-side tool filter for Plotly charts, as a custom component.
+
+With the sidebar's "Filter Charts in Browser" mode on, each chart is sent
+once with every tool as a trace, under a row of tool chips. Toggling a chip
+shows or hides that tool's traces in the browser with Plotly.restyle (the
+heatmap's rows are re-sliced instead). A filter change costs no rerun and
+sends no figure again. The chips start from the sidebar selection and keep
+their state in the page across reruns.
+
+Plotly JS is written to the static asset store under a content-hash name,
+so browsers download it once and cache it across sessions.
+"""
+import base64
+import json
+
+import streamlit as st
+
+from assets import STATIC_URL, store_asset
+from figures import get_figure_stats
+
+HTML = '<div class="trace-filter"><div class="tf-chips"></div><div class="tf-charts"></div></div>'
+
+CSS = """\
+.trace-filter .tf-chips { display: flex; flex-wrap: wrap; gap: 6px; margin-bottom: 8px; }
+.trace-filter .tf-chip {
+    border: 2px solid var(--chip-color); border-radius: 14px; padding: 2px 12px;
+    background: var(--chip-color); color: white; cursor: pointer; font-size: 14px;
+}
+.trace-filter .tf-chip.off { background: transparent; color: #888; }
+"""
+
+JS = """\
+let plotlyLoading = null;
+
+function loadPlotly(src) {
+    if (window.Plotly) return Promise.resolve();
+    plotlyLoading ??= new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = reject;
+        document.head.appendChild(script);
+    });
+    return plotlyLoading;
+}
+
+// Chip selections by component key, so a rerun that mounts the charts again keeps
+// them, until the sidebar selection they started from changes
+const selections = new Map();
+
+function applySelection(plots, tools, selected) {
+    for (const { div, rows } of plots) {
+        // Only traces named after a tool are toggled; the heatmap's single trace stays
+        const shown = div.data.map((trace) => !tools.has(trace.name) || selected.has(trace.name));
+        Plotly.restyle(div, { visible: shown });
+        for (const [index, { y, z, text }] of rows) {
+            const keep = y.map((name, i) => (selected.has(name) ? i : -1)).filter((i) => i >= 0);
+            const update = { y: [keep.map((i) => y[i])], z: [keep.map((i) => z[i])] };
+            if (text) update.text = [keep.map((i) => text[i])];
+            Plotly.restyle(div, update, [index]);
+        }
+    }
+}
+
+export default async function ({ data, key, parentElement }) {
+    const root = parentElement.querySelector('.trace-filter');
+    if (root.dataset.signature === data.signature) return;
+    root.dataset.signature = data.signature;
+
+    await loadPlotly(data.plotly);
+    const start = data.selected.join('|');
+    const saved = selections.get(key);
+    const selected = new Set(saved?.start === start ? saved.selected : data.selected);
+    const chips = root.querySelector('.tf-chips');
+    const charts = root.querySelector('.tf-charts');
+    chips.replaceChildren();
+    charts.replaceChildren();
+
+    const tools = new Set(data.tools);
+    const plots = [];
+    for (const json of data.figures) {
+        const figure = JSON.parse(json);
+        const div = document.createElement('div');
+        charts.appendChild(div);
+        await Plotly.newPlot(div, figure.data, figure.layout, { responsive: true, displaylogo: false });
+        // Heatmaps have one trace with a row per tool; keep the full rows to slice from
+        const rows = new Map();
+        figure.data.forEach((trace, index) => {
+            if (trace.type === 'heatmap') rows.set(index, { y: trace.y, z: trace.z, text: trace.text });
+        });
+        plots.push({ div, rows });
+    }
+
+    for (const tool of data.tools) {
+        const chip = document.createElement('button');
+        chip.className = 'tf-chip' + (selected.has(tool) ? '' : ' off');
+        chip.style.setProperty('--chip-color', data.colors[tool]);
+        chip.textContent = tool;
+        chip.onclick = () => {
+            selected.has(tool) ? selected.delete(tool) : selected.add(tool);
+            chip.classList.toggle('off', !selected.has(tool));
+            selections.set(key, { start, selected: [...selected] });
+            applySelection(plots, tools, selected);
+        };
+        chips.appendChild(chip);
+    }
+    applySelection(plots, tools, selected);
+}
+"""
+
+# Mounted inline (not in a shadow root), so Plotly's own styles reach the charts
+_trace_filter = st.components.v2.component("trace_filter", html=HTML, css=CSS, js=JS, isolate_styles=False)
+
+
+@st.cache_resource(show_spinner=False)
+def get_plotly_js_url():
+    # Written once per server process; the content hash changes with the plotly version
+    import plotly.offline
+
+    return f"{STATIC_URL}/{store_asset('plotly', plotly.offline.get_plotlyjs().encode('utf-8'), '.js')}"
+
+
+def figure_json(fig):
+    """(JSON, its size in bytes) of the figure for the component, heatmap values as nested lists.
+
+    Plotly encodes numpy arrays as base64 typed-array specs; the component
+    slices heatmap rows itself, so those are decoded here. Figures come from
+    the version-keyed cache and are never changed, so the JSON is built once
+    per figure object and kept on it (like figures.payload_bytes).
+    """
+    encoded = getattr(fig, '_figure_json', None)
+    if encoded is None:
+        encoded = fig._figure_json = _figure_json(fig)
+    return encoded
+
+
+def _figure_json(fig):
+    import numpy as np
+    from plotly.utils import PlotlyJSONEncoder
+
+    spec = fig.to_plotly_json()
+    for trace in spec['data']:
+        z = trace.get('z')
+        if trace.get('type') == 'heatmap' and isinstance(z, dict) and 'bdata' in z:
+            values = np.frombuffer(base64.b64decode(z['bdata']), dtype=z['dtype'])
+            shape = [int(n) for n in str(z.get('shape', len(values))).split(',')]
+            trace['z'] = values.reshape(shape).tolist()
+    payload = json.dumps(spec, cls=PlotlyJSONEncoder)
+    return payload, len(payload.encode('utf-8'))
+
+
+def filtered_charts(figures, signature, tools, selected, colors, key):
+    """Mount figures ({kind: figure} built with every tool) behind in-browser tool chips.
+
+    signature identifies the figures (data version and kinds); the browser
+    only redraws when it or the starting selection changes.
+    """
+    payloads = []
+    for kind, fig in figures.items():
+        payload, size = figure_json(fig)
+        payloads.append(payload)
+        get_figure_stats().record(kind, size)
+    _trace_filter(key=key, data={
+        'plotly': get_plotly_js_url(),
+        'signature': '|'.join([signature, *selected]),
+        'figures': payloads,
+        'tools': list(tools),
+        'selected': list(selected),
+        'colors': {tool: colors[tool] for tool in tools},
+    })
@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """Bounded LRU of derived views (figures, HTML) keyed by (data version, tools, kind)."""
+
+    def __init__(self, maxsize=64, static_kinds=(), category_kinds=()):
+        self.maxsize = maxsize
+        # Kinds that do not read the catalog, so edits never invalidate them
+        self.static_kinds = set(static_kinds)
+        # Kind prefixes whose views depend on the catalog's category set
+        self.category_kinds = tuple(category_kinds)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, tools, kind, build):
+        key = (version, tuple(tools), kind)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def carry_over(self, old_version, new_version, changed_tools, categories_changed=False):
+        """Reuse old_version entries that do not involve changed_tools under new_version.
+
+        Entries touching a changed tool are simply not carried over, so only
+        they are rebuilt; old_version entries stay for sessions still on it.
+        When the category set changed, category_kinds entries are not carried
+        over either, whatever tools they show.
+        """
+        changed = set(changed_tools)
+        with self._lock:
+            for (version, tools, kind), value in list(self._entries.items()):
+                if version != old_version:
+                    continue
+                stale = changed.intersection(tools) or categories_changed and kind.startswith(self.category_kinds)
+                if kind in self.static_kinds or not stale:
+                    self._entries.setdefault((new_version, tools, kind), value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class VersionedRegistry:
+    """One derived object per data version (a ranking engine, a search index), LRU-bounded.
+
+    build(source) makes one from scratch. update(previous, source, changed_tools)
+    derives the next version's object from the previous version's after an
+    edit, so only the changed tools are recomputed. Both run outside the lock:
+    a slow build never blocks sessions asking for other versions, and if two
+    sessions build the same version at once, the first one stored is kept.
+    """
+
+    def __init__(self, build, update, maxsize=16):
+        self.build = build
+        self.update = update
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _put(self, version, value):
+        # Called with the lock held; keeps an entry another thread stored first
+        value = self._entries.setdefault(version, value)
+        self._entries.move_to_end(version)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def get(self, version, source):
+        with self._lock:
+            value = self._entries.get(version)
+            if value is not None:
+                self._entries.move_to_end(version)
+                return value
+        value = self.build(source)
+        with self._lock:
+            return self._put(version, value)
+
+    def carry_over(self, old_version, new_version, source, changed_tools):
+        with self._lock:
+            previous = self._entries.get(old_version)
+            if previous is None or new_version in self._entries:
+                return
+        value = self.update(previous, source, changed_tools)
+        with self._lock:
+            self._put(new_version, value)
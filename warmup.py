@@ -0,0 +1,49 @@
+"""Pre-warm the process-wide caches before the first session connects.
+
+Everything built here lives in st.cache_resource singletons keyed by data
+version, so the first visitor finds the score matrix, rankings, search index,
+assets and default figures already built. Called from serve.py at server boot.
+"""
+import time
+
+from assets import BRAND_COLORS, ToolColors, get_asset_store
+from base_catalog import SessionCatalog
+from catalog import base_catalog, data_version
+from figures import BUILDERS, cached_figure
+from recommender import PRIORITY_WEIGHTS, TASK_WEIGHTS, get_recommender_registry
+from score_matrix import get_score_matrix
+from search import get_search_registry
+
+
+def prewarm():
+    """Build the caches a new session needs; returns {step: seconds}."""
+    timings = {}
+
+    def step(name, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[name] = time.perf_counter() - start
+        return result
+
+    # The deferred heavy imports, paid once here instead of by the first visitor
+    step('import pandas', lambda: __import__('pandas'))
+    step('import plotly', lambda: (__import__('plotly.graph_objects'), __import__('plotly.express')))
+    # set_page_config(page_icon=...) compiles Streamlit's emoji regex on first use
+    step('import streamlit.emojis', lambda: __import__('streamlit.emojis'))
+
+    # New sessions start from the journal's catalog, so its version is the one to warm
+    data = SessionCatalog(step('load catalog', base_catalog))
+    version = data_version(data)
+    tools = list(data['tools'])
+
+    matrix = step('score matrix', lambda: get_score_matrix(version, data['tools']))
+    recommender = get_recommender_registry().get(version, matrix)
+    step('rankings', lambda: [recommender.fit_scores(w) for w in (*TASK_WEIGHTS.values(), *PRIORITY_WEIGHTS.values())])
+    step('search index', lambda: get_search_registry().get(version, data['tools']))
+    step('assets', lambda: get_asset_store(version, data['tools']))
+
+    # Figures for the default selection (every tool), as the first render asks for them
+    colors = ToolColors(BRAND_COLORS)
+    for kind in BUILDERS:
+        step(f'figure {kind}', lambda kind=kind: cached_figure(kind, version, matrix, tools, colors))
+    return timings
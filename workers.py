@@ -0,0 +1,145 @@
+"""Run several app workers behind one port, for more than one core.
+
+    python workers.py --workers 4 --port 8501
+
+Starts N `streamlit run serve.py` processes on consecutive ports after
+--port and a small TCP balancer on --port in front of them. Each worker has
+its own sessions and caches. All of them share the SQLite catalog store
+(journal/catalog.db) and the static asset folder. An edit saved on one
+worker reaches the others within catalog.SYNC_INTERVAL: their background
+sync reads the new edit rows from the store and carries over every cached
+card, figure, ranking and search entry the edit did not touch.
+
+A session must stay on one worker, because its state and its file uploads
+live there. The balancer sends each new connection to the worker with the
+fewest open connections. It pins a browser to that worker with a cookie, so
+the page, its websocket and its uploads all land on the same worker. In
+production, nginx or another proxy does the same job (sticky cookie or
+ip_hash, with websocket upgrades passed through).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from assets import APP_DIR
+
+COOKIE = b'st_worker'
+COOKIE_PATTERN = re.compile(rb'^cookie:.*\b' + COOKIE + rb'=(\d+)', re.IGNORECASE | re.MULTILINE)
+
+logger = logging.getLogger(__name__)
+
+
+def start_worker(script, port):
+    return subprocess.Popen([
+        sys.executable, '-m', 'streamlit', 'run', script,
+        '--server.port', str(port), '--server.headless', 'true',
+    ], cwd=APP_DIR)
+
+
+def wait_healthy(port, timeout=60):
+    for _ in range(int(timeout * 10)):
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"worker on port {port} did not start")
+
+
+class Balancer:
+    """Sticky TCP balancer: least connections for new browsers, a cookie after that."""
+
+    def __init__(self, ports):
+        self.ports = ports
+        self.active = [0] * len(ports)
+
+    def _pick(self, head):
+        match = COOKIE_PATTERN.search(head)
+        if match and int(match[1]) < len(self.ports):
+            return int(match[1]), False
+        return self.active.index(min(self.active)), True
+
+    async def handle(self, client_reader, client_writer):
+        upstream_writer = None
+        try:
+            # The first request's headers pick the worker; everything after is piped as-is
+            head = await client_reader.readuntil(b'\r\n\r\n')
+            worker, new = self._pick(head)
+            self.active[worker] += 1
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection('127.0.0.1', self.ports[worker])
+                upstream_writer.write(head)
+                response = await upstream_reader.readuntil(b'\r\n\r\n')
+                if new:
+                    cookie = b'Set-Cookie: %s=%d; Path=/; HttpOnly; SameSite=Lax\r\n' % (COOKIE, worker)
+                    response = response[:-2] + cookie + b'\r\n'
+                client_writer.write(response)
+                await asyncio.gather(_pipe(client_reader, upstream_writer), _pipe(upstream_reader, client_writer))
+            finally:
+                self.active[worker] -= 1
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            client_writer.close()
+            if upstream_writer is not None:
+                upstream_writer.close()
+
+
+async def _pipe(reader, writer):
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        if writer.can_write_eof():
+            try:
+                writer.write_eof()
+            except OSError:
+                pass
+
+
+async def serve(host, port, balancer):
+    server = await asyncio.start_server(balancer.handle, host, port)
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set_result, None)
+    async with server:
+        await stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several app workers behind one sticky balancer.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8501, help="balancer port; workers take the ports after it")
+    parser.add_argument('--script', default='serve.py')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    ports = [args.port + 1 + i for i in range(args.workers)]
+    workers = [start_worker(args.script, port) for port in ports]
+    try:
+        for port in ports:
+            wait_healthy(port)
+        logger.info("%d workers on ports %s; serving on http://%s:%d", len(ports),
+                    ', '.join(map(str, ports)), args.host, args.port)
+        asyncio.run(serve(args.host, args.port, Balancer(ports)))
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+
+if __name__ == '__main__':
+    main()